@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+class Camera:
+    def __init__(self, width, height, margin=4):
+        """
+        Crée une caméra : la fenêtre du niveau visible à l'écran
+        margin: distance minimale (en cases) entre le joueur et le bord de la fenêtre
+        """
+        self.x = 0
+        self.y = 0
+        self.width = width
+        self.height = height
+        self.margin = margin
+
+    def resize(self, width, height):
+        """
+        Change la taille de la fenêtre (après un redimensionnement du terminal)
+        """
+        self.width = width
+        self.height = height
+
+    def follow(self, x, y, level_width, level_height):
+        """
+        Déplace la fenêtre pour garder la position (x, y) visible, sans sortir du niveau
+        """
+        self.x = self.follow_axis(self.x, x, self.width, level_width)
+        self.y = self.follow_axis(self.y, y, self.height, level_height)
+
+    def follow_axis(self, start, position, size, level_size):
+        """
+        Calcule le début de la fenêtre sur un axe
+        """
+        # La marge ne peut pas dépasser la moitié de la fenêtre
+        margin = max(0, min(self.margin, (size - 1) // 2))
+
+        if position < start + margin:
+            start = position - margin
+        elif position > start + size - 1 - margin:
+            start = position - (size - 1 - margin)
+
+        # Un niveau plus petit que la fenêtre reste collé en haut à gauche
+        return max(0, min(start, level_size - size))
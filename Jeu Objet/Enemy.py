@@ -1,13 +1,23 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import sys
+from Tile import SOLID, BLOCKING, TELEPORTER, SPAWN, OUTSIDE
+
+# Apparence des ennemis selon leur type, partagée par tous les ennemis
+CHARS = {1: 'E', 2: 'F'}  # E pour standard, F pour gravité inverse
+COLORS = {1: "\033[31m", 2: "\033[33m"}  # Rouge ou jaune
+INACTIVE_COLOR = "\033[37m"  # Gris clair
 
 
 class Enemy:
-    def __init__(self, x, y, enemy_type=1):
+    # Attributs fixés à l'avance : pas de dictionnaire par ennemi, accès plus rapide
+    __slots__ = ('x', 'y', 'type', 'state', 'direction', 'speed', 'movement_counter', 'min_x', 'max_x')
+
+    def __init__(self, x, y, enemy_type=1, level=None, bounds=None):
         """
         Crée un ennemi
+        level: niveau où l'ennemi apparaît, pour calculer sa patrouille (sans niveau, il reste sur place)
+        bounds: bornes (min_x, max_x) de la patrouille si elles sont déjà connues (table d'apparition du niveau)
 
         Types:
         1: ennemi rouge (standard) - actif en gravité normale
@@ -15,13 +25,54 @@ class Enemy:
         """
         self.x = x
         self.y = y
-        self.color = "\033[31m" if enemy_type == 1 else "\033[33m"  # Rouge ou Jaune
         self.type = enemy_type  # 1: standard, 2: gravité inverse
         self.state = 0  # 0: état normal, 1: inactif
         self.direction = 1  # 1: droite, -1: gauche
         self.speed = 0.1
         self.movement_counter = 0
 
+        # Bornes de la patrouille : le niveau ne change pas, elles sont calculées une seule fois
+        if bounds is not None:
+            self.min_x, self.max_x = bounds
+        else:
+            self.min_x, self.max_x = self.patrol_bounds(level) if level is not None else (x, x)
+
+    @property
+    def color(self):
+        """
+        Couleur de l'ennemi actif, selon son type
+        """
+        return COLORS[self.type]
+
+    def walkable(self, level, x, y):
+        """
+        Indique si l'ennemi peut se placer sur la case (x, y) : elle ne doit pas le bloquer
+        et doit avoir un sol (type 1) ou un plafond (type 2), le bord du niveau n'en servant pas
+        """
+        if self.type == 1:
+            walls, support = SOLID | TELEPORTER, y + 1
+        else:
+            walls, support = SOLID | TELEPORTER | SPAWN, y - 1
+
+        # Une case hors du niveau bloque comme un mur
+        if level.flag(x, y) & walls:
+            return False
+
+        beside = level.flag(x, support)
+        return not beside & OUTSIDE and bool(beside & BLOCKING)
+
+    def patrol_bounds(self, level):
+        """
+        Calcule les colonnes extrêmes de la patrouille de part et d'autre de la position de départ
+        """
+        y = int(self.y)
+        min_x = max_x = int(self.x)
+        while self.walkable(level, min_x - 1, y):
+            min_x -= 1
+        while self.walkable(level, max_x + 1, y):
+            max_x += 1
+        return min_x, max_x
+
     def get_pos(self):
         """
         Récupère les coordonnées de l'ennemi
@@ -35,70 +86,29 @@ class Enemy:
         self.x = x
         self.y = y
 
+    def is_active_for(self, gravity):
+        """
+        Indique si l'ennemi est actif pour la gravité du joueur donnée
+        """
+        return (self.type == 1) == (gravity > 0)
+
     def move(self, game_data):
         """
         Déplace l'ennemi
+        Seuls les ennemis actifs sont déplacés : le moteur ne l'appelle pas pour les ennemis suspendus
         """
-        level = game_data.levels[game_data.level - 1]
+        # Mouvement de patrouille simple
+        self.movement_counter += self.speed
 
-        # Vérifier si l'ennemi est actif selon son type et la gravité du joueur
-        is_active = True
-        if (self.type == 1 and game_data.player.gravity < 0) or (self.type == 2 and game_data.player.gravity > 0):
-            is_active = False
-            self.state = 1  # Inactif
-        else:
-            self.state = 0  # Actif
-
-        # Ne déplacer que les ennemis actifs
-        if is_active:
-            # Mouvement de patrouille simple
-            self.movement_counter += self.speed
-
-            if self.movement_counter >= 1:
-                self.movement_counter -= 1
-                if self.type == 1:
-                    # Calculer la nouvelle position potentielle
-                    new_x = int(self.x + self.direction)
-                    y_int = int(self.y)
-
-                    # Vérifier s'il y a une collision ou un vide en dessous
-                    if (new_x < 0 or new_x >= level.width or y_int >= level.height or
-                            (y_int < level.height and y_int >= 0 and new_x < len(level.grille[y_int]) and
-                             (level.grille[y_int][new_x] == '#' or level.grille[y_int][new_x] == '+'))):
-                        # Changer de direction
-                        self.direction *= -1
-                    else:
-                        # Vérifier s'il y a un sol sous l'ennemi
-                        if (y_int + 1 >= level.height or
-                                (y_int + 1 < level.height and new_x < len(level.grille[y_int + 1]) and
-                                 level.grille[y_int + 1][new_x] != '#' and
-                                 level.grille[y_int + 1][new_x] != '=')):
-                            # Pas de sol, changer de direction
-                            self.direction *= -1
-                        else:
-                            # Déplacer l'ennemi
-                            self.x = new_x
-                elif self.type == 2:
-                    new_x = int(self.x + self.direction)
-                    y_int = int(self.y)
-
-                    if (new_x < 0 or new_x >= level.width or y_int >= level.height or
-                            (y_int < level.height and y_int >= 0 and new_x < len(level.grille[y_int]) and
-                             (level.grille[y_int][new_x] == '#' or level.grille[y_int][new_x] == '+' or
-                              level.grille[y_int][new_x] == 'E'))):
-                        # Changer de direction
-                        self.direction *= -1
-                    else:
-                        # Vérifier s'il y a un plafond sur l'ennemi
-                        if (y_int - 1 >= level.height or
-                                (y_int - 1 < level.height and new_x < len(level.grille[y_int - 1]) and
-                                 level.grille[y_int - 1][new_x] != '#' and
-                                 level.grille[y_int - 1][new_x] != '=')):
-                            # Pas de plafond, changer de direction
-                            self.direction *= -1
-                        else:
-                            # Déplacer l'ennemi
-                            self.x = new_x
+        if self.movement_counter >= 1:
+            self.movement_counter -= 1
+            # Rebondir sur les bornes de la patrouille, calculées à l'apparition
+            new_x = self.x + self.direction
+            if self.min_x <= new_x <= self.max_x:
+                game_data.occupancy.move(self, self.x, self.y, new_x, self.y)
+                self.x = new_x
+            else:
+                self.direction *= -1
 
     def test_player_collision(self, player):
         """
@@ -122,10 +132,13 @@ class Enemy:
     def update(self, game_data):
         """
         Met à jour l'état de l'ennemi
+        Retourne True si son apparence à l'écran a changé
         """
+        old_x = self.x
         self.move(game_data)
+        return self.x != old_x
 
-    def show(self):
+    def show(self, renderer):
         """
         Affiche l'ennemi
         """
@@ -134,10 +147,10 @@ class Enemy:
         y = int(self.y)
 
         # Caractère selon le type d'ennemi
-        char = 'E' if self.type == 1 else 'F'  # E pour standard, F pour gravité inverse
+        char = CHARS[self.type]
 
         # Ne pas afficher les ennemis inactifs (ou les afficher différemment)
         if self.state == 0:  # Actif
-            sys.stdout.write(f"\033[{y + 1};{x + 1}H{self.color}{char}\033[0m")
+            renderer.put(x, y, char, COLORS[self.type])
         else:  # Inactif - afficher en semi-transparent (gris clair)
-            sys.stdout.write(f"\033[{y + 1};{x + 1}H\033[37m{char}\033[0m")
\ No newline at end of file
+            renderer.put(x, y, char, INACTIVE_COLOR)
\ No newline at end of file
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from array import array
+from Enemy import CHARS, COLORS, INACTIVE_COLOR
+
+
+class EnemyPool:
+    def __init__(self, level, enemies=()):
+        """
+        Crée un groupe d'ennemis rangé en tableaux, un tableau par attribut, plutôt qu'en objets
+        Les ennemis qui avancent au même rythme (même type, même vitesse, même compteur de
+        mouvement) forment une cohorte : son compteur n'avance qu'une fois par pas de simulation,
+        et ses membres ne sont parcourus qu'aux pas où ils bougent, pour les niveaux qui comptent
+        des centaines ou des milliers d'ennemis
+        level: niveau où se trouvent les ennemis
+        enemies: ennemis (Enemy) à ranger dans le groupe
+        """
+        self.x = array('l')
+        self.y = array('l')
+        self.type = array('b')  # 1: standard, 2: gravité inverse
+        self.state = array('b')  # 0: actif, 1: inactif
+        self.direction = array('b')
+        self.min_x = array('l')  # Bornes de la patrouille
+        self.max_x = array('l')
+
+        # Cohortes : vitesse et compteur de mouvement communs, numéros des ennemis membres
+        self.cohort_speed = array('d')
+        self.cohort_counter = array('d')
+        self.cohort_members = []
+        self.cohorts = {enemy_type: [] for enemy_type in (1, 2)}  # Numéros des cohortes par type
+
+        # Occupation des cases : nombre d'ennemis de chaque type par case du niveau,
+        # tenu à jour à chaque déplacement
+        self.width = level.width
+        self.height = level.height
+        self.occupancy = {enemy_type: array('H', [0]) * (level.width * level.height) for enemy_type in (1, 2)}
+        self.active = (1, 2)  # Types des ennemis actifs (tous tant que la gravité n'est pas connue)
+        self.members = {enemy_type: array('l') for enemy_type in (1, 2)}  # Numéros des ennemis par type
+
+        for enemy in enemies:
+            self.add(enemy)
+
+    def __len__(self):
+        return len(self.x)
+
+    def cohort(self, enemy_type, speed, counter):
+        """
+        Numéro de la cohorte des ennemis de ce type qui avancent à cette vitesse avec ce compteur,
+        créée si elle n'existe pas encore
+        """
+        for c in self.cohorts[enemy_type]:
+            if self.cohort_speed[c] == speed and self.cohort_counter[c] == counter:
+                return c
+        c = len(self.cohort_speed)
+        self.cohort_speed.append(speed)
+        self.cohort_counter.append(counter)
+        self.cohort_members.append(array('l'))
+        self.cohorts[enemy_type].append(c)
+        return c
+
+    def add(self, enemy):
+        """
+        Ajoute un ennemi au groupe (ses bornes de patrouille doivent être calculées)
+        """
+        i = len(self.x)
+        self.occupancy[enemy.type][int(enemy.y) * self.width + int(enemy.x)] += 1
+        self.members[enemy.type].append(i)
+        self.cohort_members[self.cohort(enemy.type, enemy.speed, enemy.movement_counter)].append(i)
+        self.x.append(int(enemy.x))
+        self.y.append(int(enemy.y))
+        self.type.append(enemy.type)
+        self.state.append(enemy.state)
+        self.direction.append(enemy.direction)
+        self.min_x.append(enemy.min_x)
+        self.max_x.append(enemy.max_x)
+
+    def active_count(self):
+        """
+        Nombre d'ennemis actifs, les seuls mis à jour à chaque pas
+        """
+        return sum(len(self.members[enemy_type]) for enemy_type in self.active)
+
+    def update(self, gravity):
+        """
+        Met à jour les ennemis actifs selon la gravité du joueur (voir Enemy.move)
+        Les ennemis suspendus ne sont parcourus que lorsque la gravité s'inverse
+        Retourne True si l'apparence d'au moins un ennemi à l'écran a changé
+        """
+        # Seuls les ennemis du type correspondant à la gravité sont actifs
+        active_type = 1 if gravity > 0 else 2
+        changed = False
+
+        if self.active != (active_type,):
+            self.active = (active_type,)
+            for i in self.members[active_type]:
+                self.state[i] = 0  # Actif
+            for i in self.members[3 - active_type]:  # L'autre type
+                self.state[i] = 1  # Inactif (affiché en gris)
+            changed = len(self) > 0
+
+        xs, ys, directions, min_xs, max_xs = self.x, self.y, self.direction, self.min_x, self.max_x
+        speeds, counters = self.cohort_speed, self.cohort_counter
+        occupancy = self.occupancy[active_type]
+        width = self.width
+
+        for c in self.cohorts[active_type]:
+            # Un seul compteur par cohorte : tous ses membres bougent au même pas
+            counter = counters[c] + speeds[c]
+            if counter >= 1:
+                counter -= 1
+                for i in self.cohort_members[c]:
+                    # Mouvement de patrouille : rebond entre les bornes calculées à l'apparition
+                    new_x = xs[i] + directions[i]
+                    if min_xs[i] <= new_x <= max_xs[i]:
+                        cell = ys[i] * width + xs[i]
+                        occupancy[cell] -= 1
+                        occupancy[cell + directions[i]] += 1
+                        xs[i] = new_x
+                        changed = True
+                    else:
+                        directions[i] = -directions[i]
+            counters[c] = counter
+
+        return changed
+
+    def hit(self, x, y):
+        """
+        Indique si un ennemi actif occupe la case (x, y) du joueur
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        cell = y * self.width + x
+        return any(self.occupancy[enemy_type][cell] for enemy_type in self.active)
+
+    def show(self, renderer):
+        """
+        Affiche tous les ennemis (les inactifs en gris clair)
+        """
+        for i, x in enumerate(self.x):
+            enemy_type = self.type[i]
+            color = COLORS[enemy_type] if self.state[i] == 0 else INACTIVE_COLOR
+            renderer.put(x, self.y[i], CHARS[enemy_type], color)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+class Governor:
+    def __init__(self, period, period_min, period_max, budget=0.25, smoothing=0.2):
+        """
+        Régulateur de la cadence d'affichage
+        La période entre deux images s'adapte au coût mesuré de chaque image (construction + écriture)
+        pour que l'affichage n'occupe qu'une fraction du temps, entre period_min et period_max
+        budget: fraction du temps que l'affichage peut occuper
+        smoothing: poids d'une nouvelle mesure dans la moyenne glissante du coût
+        """
+        self.period = period
+        self.period_min = period_min
+        self.period_max = period_max
+        self.budget = budget
+        self.smoothing = smoothing
+        self.cost = 0  # Coût moyen d'une image (secondes)
+        self.frames = 0  # Images affichées
+        self.drops = 0  # Images abandonnées car la sortie était saturée
+
+    def clamp(self, period):
+        """
+        Garde une période entre les bornes configurées
+        """
+        return max(self.period_min, min(period, self.period_max))
+
+    def record(self, cost):
+        """
+        Prend en compte le coût d'une image affichée et ajuste la période
+        """
+        if self.frames == 0:
+            self.cost = cost
+        else:
+            self.cost += self.smoothing * (cost - self.cost)
+        self.frames += 1
+        self.period = self.clamp(self.cost / self.budget)
+
+    def dropped(self):
+        """
+        Une image a été abandonnée (sortie saturée, par exemple une liaison SSH lente) :
+        ralentir la cadence au lieu d'accumuler des images en attente
+        """
+        self.drops += 1
+        self.period = self.clamp(self.period * 2)
@@ -1,17 +1,19 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import sys
-
 
 class Key:
+    # Attributs fixés à l'avance : pas de dictionnaire par clé
+    __slots__ = ('x', 'y')
+
+    color = "\033[33m"  # Couleur jaune, commune à toutes les clés
+
     def __init__(self, x, y):
         """
         Crée une clé
         """
         self.x = x
         self.y = y
-        self.color = "\033[33m"  # Couleur jaune
 
     def get_pos(self):
         """
@@ -26,11 +28,11 @@ class Key:
         self.x = x
         self.y = y
 
-    def show(self):
+    def show(self, renderer):
         """
         Affiche la clé
         """
         # Convertir en entiers pour l'affichage
         x = int(self.x)
         y = int(self.y)
-        sys.stdout.write(f"\033[{y + 1};{x + 1}H{self.color}K\033[0m")
\ No newline at end of file
+        renderer.put(x, y, 'K', self.color)
\ No newline at end of file
@@ -1,20 +1,61 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import sys
+import io
+from array import array
 from Player import Player
 from Key import Key
 from Enemy import Enemy
+import LevelCompiler
+from Renderer import BLANK
+from Tile import FLAGS, BLOCKING, EXIT, TELEPORTER, OUT_OF_BOUNDS
+
+# Apparence des cases fixes du niveau : caractère -> (caractère affiché, couleur)
+# Les ennemis, le joueur et la clé sont dessinés par leur propre show(),
+# toutes les autres cases restent vides
+TILES = {
+    '#': (' ', "\033[47m"),  # Bloc blanc
+    'S': ('S', "\033[36m"),  # Sortie en cyan
+    '=': ('=', "\033[37m"),  # Plateforme en gris
+    '+': ('▓', "\033[45m"),  # Téléporteur en magenta
+}
 
 
 class Level:
-    def __init__(self, filename, offset):
+    def __init__(self, filename, offset, source=None):
         """
         Charge un niveau depuis un fichier
+        Si une version compilée à jour existe (voir LevelCompiler.py), elle est projetée
+        en mémoire à la place du texte
+        source: contenu du niveau déjà lu (texte ou compilé), par exemple depuis un paquet
+        de niveaux (voir LevelPack.py) : le fichier n'est alors pas ouvert
         """
+        self.offset = offset
+
+        if source is None:
+            compiled = LevelCompiler.load_compiled(filename)
+        elif LevelCompiler.is_compiled(source):
+            compiled = LevelCompiler.parse(source, filename)
+        else:
+            compiled = None
+
+        if compiled is not None:
+            self.grille = compiled['grille']
+            self.width = compiled['width']
+            self.height = compiled['height']
+            self.background = self.build_background()
+            self.flags = compiled['flags']
+            self.floor = compiled['floor']
+            self.ceiling = compiled['ceiling']
+            self.spawns = compiled['spawns']
+            return
+
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            if source is None:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    lines = f.readlines()
+            else:
+                lines = io.StringIO(str(source, 'utf-8'), newline=None).readlines()
         except FileNotFoundError:
             # Si le fichier n'existe pas, créer un niveau par défaut
             lines = [
@@ -46,70 +87,137 @@ class Level:
         self.grille = lines
         self.width = max_length
         self.height = len(lines)
-        self.offset = offset
 
-    def check_exit(self, player, game_data):
+        # Fond statique pré-calculé une seule fois au chargement
+        self.background = self.build_background()
+
+        # Drapeaux de chaque case (voir Tile.py), une case par octet, ligne après ligne
+        self.flags = self.build_flags()
+
+        # Pour chaque case, première ligne bloquante en dessous et au-dessus dans sa colonne
+        self.floor, self.ceiling = self.build_landing()
+
+        # Positions d'apparition du joueur, de la clé et des ennemis (avec leur patrouille)
+        self.spawns = self.build_spawns()
+
+    def build_background(self):
         """
-        Vérifie si le joueur atteint la sortie
+        Construit les lignes de cellules du décor fixe (murs, plateformes, sorties, téléporteurs)
+        """
+        return [[TILES.get(char, BLANK) for char in line] for line in self.grille]
+
+    def build_flags(self):
+        """
+        Construit la grille des drapeaux des cases, consultée par les tests de collision
+        """
+        return bytearray(FLAGS.get(char, 0) for line in self.grille for char in line)
+
+    def build_landing(self):
+        """
+        Construit les tables d'atterrissage : pour chaque case, la ligne de la première case
+        bloquante en dessous (floor) et au-dessus (ceiling) dans la même colonne
+        Sans case bloquante, floor vaut la hauteur du niveau et ceiling -1 : le bord du niveau bloque
+        """
+        width, height = self.width, self.height
+        floor = array('h', [height]) * (width * height)
+        ceiling = array('h', [-1]) * (width * height)
+
+        for x in range(width):
+            below = height
+            for y in range(height - 1, -1, -1):
+                floor[y * width + x] = below
+                if self.flags[y * width + x] & BLOCKING:
+                    below = y
+
+            above = -1
+            for y in range(height):
+                ceiling[y * width + x] = above
+                if self.flags[y * width + x] & BLOCKING:
+                    above = y
+
+        return floor, ceiling
+
+    def build_spawns(self):
+        """
+        Construit la table d'apparition des entités, lue à chaque (re)démarrage du niveau :
+        player et key: position (x, y) ou None, enemies: (x, y, type, min_x, max_x) pour chaque ennemi,
+        les ennemis standard d'abord, exits et teleporters: positions des sorties et des téléporteurs
+        Les listes suivent l'ordre de lecture de la grille
+        """
+        spawns = {'player': None, 'key': None, 'enemies': [], 'exits': [], 'teleporters': []}
+        standard = []
+        inverted = []
+        for y, line in enumerate(self.grille):
+            for x, char in enumerate(line):
+                if char == '@':
+                    spawns['player'] = (x, y)
+                elif char == 'K':
+                    spawns['key'] = (x, y)
+                elif char == 'E':
+                    standard.append((x, y, 1))
+                elif char == 'F':
+                    inverted.append((x, y, 2))
+                elif char == 'S':
+                    spawns['exits'].append((x, y))
+                elif char == '+':
+                    spawns['teleporters'].append((x, y))
+
+        # Bornes de patrouille calculées par l'ennemi lui-même à son apparition
+        enemies = [Enemy(x, y, enemy_type, self) for x, y, enemy_type in standard + inverted]
+        spawns['enemies'] = [(e.x, e.y, e.type, e.min_x, e.max_x) for e in enemies]
+        return spawns
+
+    def player_spawn(self):
+        """
+        Position de départ du joueur
+        """
+        return self.spawns['player'] or (5, 5)  # Position par défaut
+
+    def landing(self, x, y, gravity):
+        """
+        Récupère la ligne de la première case bloquante rencontrée en partant de la case (x, y)
+        dans le sens de la gravité : un joueur qui tombe depuis (x, y) s'arrête sur la ligne
+        landing - gravity
         """
-        x, y = int(player.x), int(player.y)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            i = y * self.width + x
+            return self.floor[i] if gravity > 0 else self.ceiling[i]
+        # Hors du niveau, la case voisine bloque comme un mur
+        return y + gravity
 
-        # S'assurer que les coordonnées sont valides
-        if y < 0 or y >= len(self.grille) or x < 0 or x >= len(self.grille[y]):
-            return False
+    def flag(self, x, y):
+        """
+        Récupère les drapeaux de la case (x, y), coordonnées entières
+        Une case hors du niveau se comporte comme un mur
+        """
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.flags[y * self.width + x]
+        return OUT_OF_BOUNDS
 
+    def check_exit(self, player, game_data):
+        """
+        Vérifie si le joueur atteint la sortie
+        """
         # Vérifier si la position contient la sortie (et si le joueur a la clé)
-        return self.grille[y][x] == 'S' and game_data.has_key
+        return bool(self.flag(int(player.x), int(player.y)) & EXIT) and game_data.has_key
 
     def check_secret_exit(self, player, game_data):
         """
         Vérifie si le joueur atteint la sortie secrète
         """
-        x, y = int(player.x), int(player.y)
-
-        # S'assurer que les coordonnées sont valides
-        if y < 0 or y >= len(self.grille) or x < 0 or x >= len(self.grille[y]):
-            return False
-
         # Vérifier si la position contient la sortie secrète
-        return self.grille[y][x] == '+'
+        return bool(self.flag(int(player.x), int(player.y)) & TELEPORTER)
 
     def check_teleporter(self, player):
         """
         Vérifie si le joueur atteint un téléporteur
         """
-        x, y = int(player.x), int(player.y)
-
-        # S'assurer que les coordonnées sont valides
-        if y < 0 or y >= len(self.grille) or x < 0 or x >= len(self.grille[y]):
-            return False
-
         # Vérifier si la position contient un téléporteur
-        return self.grille[y][x] == '+'
+        return bool(self.flag(int(player.x), int(player.y)) & TELEPORTER)
 
-    def show(self):
+    def show(self, renderer):
         """
-        Affiche le niveau
+        Dessine le niveau dans le tampon du moteur de rendu
         """
-        for y, line in enumerate(self.grille):
-            sys.stdout.write(f"\033[{y + 1};1H")
-            for x, char in enumerate(line):
-                if char == '#':
-                    sys.stdout.write("\033[47m \033[0m")  # Bloc blanc
-                elif char == 'S':
-                    sys.stdout.write("\033[36mS\033[0m")  # Sortie en cyan
-                elif char == '=':
-                    sys.stdout.write("\033[37m=\033[0m")  # Plateforme en gris
-                elif char == '+':
-                    sys.stdout.write("\033[45m▓\033[0m")  # Téléporteur en magenta
-                elif char == 'E' or char == 'F':
-                    # Ne pas afficher les ennemis ici, ils sont gérés par Enemy.show()
-                    sys.stdout.write(" ")
-                elif char == '@':
-                    # Ne pas afficher le joueur ici, il est géré par Player.show()
-                    sys.stdout.write(" ")
-                elif char == 'K':
-                    # Ne pas afficher la clé ici, elle est gérée par Key.show()
-                    sys.stdout.write(" ")
-                else:
-                    sys.stdout.write(" ")  # Espace vide
\ No newline at end of file
+        # Le décor ne change jamais : on recopie le fond pré-calculé
+        renderer.blit(self.background)
\ No newline at end of file
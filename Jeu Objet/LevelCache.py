@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+from collections import OrderedDict
+from Level import Level
+
+
+class LevelCache:
+    def __init__(self, filenames, capacity=3, pack=None):
+        """
+        Liste des niveaux du jeu chargés à la demande
+        S'utilise comme une liste (cache[i], len(cache)) mais un niveau n'est lu qu'au premier accès,
+        et seuls les capacity derniers niveaux utilisés restent en mémoire
+        filenames: fichiers des niveaux, dans l'ordre du jeu
+        pack: paquet de niveaux où les lire (voir LevelPack.py), fichiers séparés sans paquet
+        """
+        self.filenames = list(filenames)
+        self.pack = pack
+        self.capacity = capacity
+        self.loaded = OrderedDict()  # Numéro -> niveau, du moins récemment utilisé au plus récent
+        self.replaced = {}  # Niveaux remplacés en cours de partie (niveau secret), jamais évincés
+        self.pending = {}  # Numéro -> thread de préchargement en cours
+        self.lock = threading.Lock()
+        self.current = (None, None)  # Dernier niveau demandé, relu sans verrou à chaque pas
+
+    def __len__(self):
+        return len(self.filenames)
+
+    def position(self, index):
+        """
+        Vérifie un numéro de niveau (les numéros négatifs comptent depuis la fin, comme pour une liste)
+        """
+        if index < 0:
+            index += len(self.filenames)
+        if not 0 <= index < len(self.filenames):
+            raise IndexError("numéro de niveau hors limites")
+        return index
+
+    def __getitem__(self, index):
+        current_index, current = self.current
+        if index == current_index:
+            return current
+
+        index = self.position(index)
+        level = self.replaced.get(index)
+        if level is None:
+            with self.lock:
+                level = self.loaded.get(index)
+                if level is not None:
+                    self.loaded.move_to_end(index)
+                thread = self.pending.get(index)
+
+            if level is None:
+                if thread is not None:
+                    # Le niveau est déjà en cours de chargement en arrière-plan : l'attendre
+                    thread.join()
+                    return self[index]
+                level = self.load(index)
+                self.store(index, level)
+
+        self.current = (index, level)
+        return level
+
+    def __setitem__(self, index, level):
+        """
+        Remplace un niveau pour le reste de la partie (niveau secret)
+        """
+        index = self.position(index)
+        self.replaced[index] = level
+        if self.current[0] == index:
+            self.current = (index, level)
+
+    def load(self, index):
+        """
+        Lit un niveau, depuis le paquet s'il y en a un
+        """
+        if self.pack is not None:
+            return self.pack.level(self.filenames[index])
+        return Level(self.filenames[index], 0)
+
+    def store(self, index, level):
+        """
+        Range un niveau chargé dans le cache, en évinçant les moins récemment utilisés
+        """
+        with self.lock:
+            self.loaded[index] = level
+            self.loaded.move_to_end(index)
+            while len(self.loaded) > self.capacity:
+                self.loaded.popitem(last=False)
+
+    def prefetch(self, index):
+        """
+        Charge un niveau dans un thread en arrière-plan, pendant que le niveau courant est joué
+        Ne fait rien si le niveau n'existe pas, est déjà chargé ou en cours de chargement
+        """
+        if not 0 <= index < len(self.filenames) or index in self.replaced:
+            return
+        with self.lock:
+            if index in self.loaded or index in self.pending:
+                return
+            thread = threading.Thread(target=self.load_in_background, args=(index,))
+            thread.daemon = True
+            self.pending[index] = thread
+            # Démarré sous le verrou : un thread attendu par __getitem__ a toujours démarré
+            thread.start()
+
+    def load_in_background(self, index):
+        """
+        Corps du thread de préchargement
+        """
+        try:
+            self.store(index, self.load(index))
+        finally:
+            with self.lock:
+                del self.pending[index]
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Compilateur de niveaux : transforme les fichiers niveau-XX.txt en fichiers binaires niveau-XX.lvl
+# qui contiennent tout ce que le chargement calcule à partir du texte (grille complétée, drapeaux
+# des cases, tables d'atterrissage, table d'apparition des entités avec la patrouille des ennemis)
+# Au chargement, le fichier compilé est projeté en mémoire : plus rien n'est analysé
+#
+# Utilisation : python3 LevelCompiler.py [niveau-00.txt ...]
+# Sans argument, tous les niveau-*.txt du dossier courant sont compilés
+
+import glob
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"ZLVL"
+VERSION = 2
+EXTENSION = ".lvl"
+
+# En-tête : signature, version, largeur, hauteur, nombre d'ennemis, de sorties et de téléporteurs,
+# position du joueur et de la clé (-1 si absents), taille de la grille en octets
+HEADER = struct.Struct("<4sHHHHHHhhhhI")
+# Ennemi : position, type, bornes de la patrouille
+ENEMY = struct.Struct("<hhhhh")
+# Sortie ou téléporteur : position
+POSITION = struct.Struct("<hh")
+
+# Les tables d'atterrissage sont enregistrées en petit-boutiste
+LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def compiled_path(filename):
+    """
+    Chemin du fichier compilé correspondant à un fichier de niveau texte
+    """
+    return os.path.splitext(filename)[0] + EXTENSION
+
+
+def is_fresh(filename, compiled):
+    """
+    Indique si le fichier compilé existe et n'est pas plus ancien que le texte source
+    (sans texte source, le fichier compilé suffit)
+    """
+    try:
+        compiled_time = os.stat(compiled).st_mtime_ns
+    except OSError:
+        return False
+    try:
+        return compiled_time >= os.stat(filename).st_mtime_ns
+    except OSError:
+        return True
+
+
+def dump(level):
+    """
+    Sérialise un niveau chargé (voir Level.py) au format compilé
+    """
+    spawns = level.spawns
+    player = spawns['player'] or (-1, -1)
+    key = spawns['key'] or (-1, -1)
+    grid = "\n".join(level.grille).encode('utf-8')
+    size = level.width * level.height
+
+    floor = array('h', level.floor)
+    ceiling = array('h', level.ceiling)
+    if not LITTLE_ENDIAN:
+        floor.byteswap()
+        ceiling.byteswap()
+
+    parts = [HEADER.pack(MAGIC, VERSION, level.width, level.height, len(spawns['enemies']),
+                         len(spawns['exits']), len(spawns['teleporters']),
+                         player[0], player[1], key[0], key[1], len(grid))]
+    parts.extend(ENEMY.pack(*enemy) for enemy in spawns['enemies'])
+    parts.extend(POSITION.pack(*position) for position in spawns['exits'] + spawns['teleporters'])
+    parts.append(bytes(level.flags))
+    if size % 2:
+        parts.append(b"\0")  # Tables d'atterrissage alignées sur 2 octets
+    parts.append(floor.tobytes())
+    parts.append(ceiling.tobytes())
+    parts.append(grid)
+    return b"".join(parts)
+
+
+def landing_table(view):
+    """
+    Table d'atterrissage lue directement dans le fichier projeté en mémoire
+    """
+    if LITTLE_ENDIAN:
+        return view.cast('h')
+    table = array('h', view.tobytes())
+    table.byteswap()
+    return table
+
+
+def is_compiled(data):
+    """
+    Indique si un contenu de fichier est un niveau compilé (et non un niveau texte)
+    """
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def load(compiled):
+    """
+    Projette un fichier compilé en mémoire et en extrait les données du niveau
+    Les drapeaux et les tables d'atterrissage restent des vues sur le fichier projeté
+    Lève ValueError si le fichier n'est pas un niveau compilé de cette version
+    """
+    with open(compiled, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return parse(data, compiled)
+
+
+def parse(data, compiled):
+    """
+    Extrait les données d'un niveau compilé déjà en mémoire (fichier projeté, contenu d'une archive)
+    compiled: nom du niveau compilé, pour les messages d'erreur
+    Lève ValueError si ce n'est pas un niveau compilé de cette version
+    """
+    data = memoryview(data)
+    if len(data) < HEADER.size:
+        raise ValueError(f"{compiled} : fichier trop court")
+    magic, version, width, height, count, exit_count, teleporter_count, \
+        player_x, player_y, key_x, key_y, grid_size = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{compiled} : format de niveau inconnu")
+
+    pos = HEADER.size
+    enemies = [ENEMY.unpack_from(data, pos + i * ENEMY.size) for i in range(count)]
+    pos += count * ENEMY.size
+    positions = [POSITION.unpack_from(data, pos + i * POSITION.size)
+                 for i in range(exit_count + teleporter_count)]
+    pos += len(positions) * POSITION.size
+
+    size = width * height
+    flags = data[pos:pos + size]
+    pos += size + size % 2
+    floor = landing_table(data[pos:pos + 2 * size])
+    pos += 2 * size
+    ceiling = landing_table(data[pos:pos + 2 * size])
+    pos += 2 * size
+    if len(data) != pos + grid_size:
+        raise ValueError(f"{compiled} : fichier tronqué")
+    grille = str(data[pos:], 'utf-8').split("\n")
+
+    return {
+        'grille': grille,
+        'width': width,
+        'height': height,
+        'flags': flags,
+        'floor': floor,
+        'ceiling': ceiling,
+        'spawns': {
+            'player': (player_x, player_y) if player_x >= 0 else None,
+            'key': (key_x, key_y) if key_x >= 0 else None,
+            'enemies': enemies,
+            'exits': positions[:exit_count],
+            'teleporters': positions[exit_count:]
+        }
+    }
+
+
+def load_compiled(filename):
+    """
+    Charge la version compilée d'un fichier de niveau texte si elle est à jour
+    Retourne None s'il faut relire le texte (pas de fichier compilé, périmé ou illisible)
+    """
+    compiled = compiled_path(filename)
+    if not is_fresh(filename, compiled):
+        return None
+    try:
+        return load(compiled)
+    except (OSError, ValueError):
+        return None
+
+
+def compile_file(filename):
+    """
+    Compile un fichier de niveau texte, retourne le chemin du fichier compilé
+    """
+    from Level import Level  # Level utilise ce module pour charger les niveaux compilés
+
+    if not os.path.isfile(filename):
+        raise FileNotFoundError(filename)
+
+    # Un fichier compilé à jour est relu tel quel, sinon le texte est analysé
+    data = dump(Level(filename, 0))
+    compiled = compiled_path(filename)
+
+    # Écrire dans un fichier temporaire puis le renommer : un jeu en cours ne lit jamais
+    # un fichier à moitié écrit
+    temporary = compiled + ".tmp"
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, compiled)
+    return compiled
+
+
+def main(args):
+    """
+    Compile les fichiers de niveau donnés en ligne de commande
+    """
+    filenames = args or sorted(glob.glob("niveau-*.txt"))
+    if not filenames:
+        print("Aucun fichier de niveau à compiler")
+        return 1
+
+    status = 0
+    for filename in filenames:
+        try:
+            compiled = compile_file(filename)
+        except (OSError, UnicodeDecodeError) as error:
+            print(f"{filename} : {error}")
+            status = 1
+        else:
+            print(f"{filename} -> {compiled} ({os.path.getsize(compiled)} octets)")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
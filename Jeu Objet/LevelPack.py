@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Paquet de niveaux : une archive zip qui regroupe les niveaux (texte et compilés), les niveaux
+# secrets et les écrans du jeu, décrits par un manifeste
+# L'archive est lue en une seule fois et tout son contenu est indexé en mémoire
+#
+# Construction de l'archive : python3 LevelPack.py [archive]
+# Elle est faite à partir des fichiers séparés du dossier du jeu (niveaux.pack par défaut)
+
+import glob
+import io
+import json
+import os
+import sys
+import zipfile
+import LevelCompiler
+from Level import Level
+
+PACK = "niveaux.pack"
+MANIFEST = "manifest.json"
+FORMAT = 1
+
+# Contenu du jeu, décrit par le manifeste de l'archive ou, sans archive, par ces valeurs
+LEVELS = [
+    "niveau-00.txt",
+    "niveau-01.txt",
+    "niveau-02.txt",
+    "niveau-03.txt",
+    "niveau-04.txt",
+    "niveau-05.txt",
+    "niveau-06.txt",
+    "niveau-07.txt",
+    "niveau-08.txt",
+    "niveau-09.txt"
+]
+SCREENS = {'menu': "ZZZZZZ.txt", 'game_over': "fin.txt", 'victory': "Victoire.txt"}
+
+# Dossier du jeu : l'archive y est cherchée quel que soit le dossier courant
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+class LevelPack:
+    def __init__(self, path=None):
+        """
+        Ouvre un paquet de niveaux
+        path: archive à lire (PACK dans le dossier du jeu par défaut)
+        Sans archive lisible, le paquet lit les fichiers séparés, dans le dossier courant
+        puis dans celui du jeu
+        """
+        self.path = path if path is not None else os.path.join(DIRECTORY, PACK)
+        self.entries = {}  # Nom -> contenu des fichiers de l'archive
+        self.manifest = {'format': FORMAT, 'levels': LEVELS, 'secret_levels': [], 'screens': SCREENS,
+                         'compiled': {}}
+
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                entries = {name: archive.read(name) for name in archive.namelist()}
+            manifest = json.loads(entries[MANIFEST])
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return  # Pas d'archive (ou archive illisible) : fichiers séparés
+
+        if manifest.get('format') == FORMAT:
+            self.entries = entries
+            self.manifest = manifest
+
+    def levels(self):
+        """
+        Fichiers des niveaux du jeu, dans l'ordre
+        """
+        return list(self.manifest['levels'])
+
+    def locate(self, filename):
+        """
+        Chemin d'un fichier séparé : dans le dossier courant, sinon dans celui du jeu
+        """
+        for path in (filename, os.path.join(DIRECTORY, filename)):
+            if os.path.exists(path):
+                return path
+        return filename
+
+    def exists(self, filename):
+        """
+        Indique si un fichier fait partie du paquet
+        """
+        return filename in self.entries or os.path.exists(self.locate(filename))
+
+    def stale(self, filename):
+        """
+        Indique si le fichier séparé a été modifié après la construction de l'archive :
+        l'entrée de l'archive est alors périmée (même règle que pour les niveaux compilés)
+        """
+        return filename in self.entries and not LevelCompiler.is_fresh(self.locate(filename), self.path)
+
+    def text(self, filename):
+        """
+        Contenu texte d'un fichier du paquet, None s'il n'existe pas
+        Un fichier séparé plus récent que l'archive remplace son entrée
+        """
+        data = self.entries.get(filename)
+        if data is None or self.stale(filename):
+            try:
+                with open(self.locate(filename), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                return None
+        return str(data, 'utf-8')
+
+    def screen(self, name):
+        """
+        Texte d'un écran du jeu ('menu', 'game_over' ou 'victory'), None s'il n'existe pas
+        """
+        filename = self.manifest['screens'].get(name)
+        return self.text(filename) if filename is not None else None
+
+    def level(self, filename):
+        """
+        Charge un niveau du paquet, depuis sa version compilée si l'archive la contient
+        Un niveau absent de l'archive, ou modifié depuis sa construction, est lu depuis les fichiers
+        séparés (niveau par défaut s'il manque)
+        """
+        if self.stale(filename):
+            return Level(self.locate(filename), 0)
+        compiled = self.manifest['compiled'].get(filename)
+        if compiled in self.entries:
+            try:
+                return Level(filename, 0, self.entries[compiled])
+            except ValueError:
+                pass  # Niveau compilé dans un autre format : relire le texte
+        if filename in self.entries:
+            return Level(filename, 0, self.entries[filename])
+        return Level(self.locate(filename), 0)
+
+
+def build(path=None):
+    """
+    Construit l'archive à partir des fichiers séparés du dossier du jeu : niveaux avec leur
+    version compilée, niveaux secrets et écrans
+    Retourne le chemin de l'archive
+    """
+    path = path if path is not None else os.path.join(DIRECTORY, PACK)
+    secret_levels = sorted(os.path.basename(name)
+                           for name in glob.glob(os.path.join(DIRECTORY, "niveau-secret-*.txt")))
+    manifest = {'format': FORMAT, 'levels': LEVELS, 'secret_levels': secret_levels, 'screens': SCREENS,
+                'compiled': {}}
+
+    # Écrire dans un fichier temporaire puis le renommer : un jeu en cours ne lit jamais
+    # une archive à moitié écrite
+    temporary = path + ".tmp"
+    with zipfile.ZipFile(temporary, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for filename in LEVELS + secret_levels:
+            source = os.path.join(DIRECTORY, filename)
+            with open(source, 'rb') as f:
+                archive.writestr(filename, f.read())
+            compiled = os.path.basename(LevelCompiler.compiled_path(filename))
+            archive.writestr(compiled, LevelCompiler.dump(Level(source, 0)))
+            manifest['compiled'][filename] = compiled
+        for filename in SCREENS.values():
+            with open(os.path.join(DIRECTORY, filename), 'rb') as f:
+                archive.writestr(filename, f.read())
+        archive.writestr(MANIFEST, json.dumps(manifest, indent=2, ensure_ascii=False))
+    os.replace(temporary, path)
+    return path
+
+
+def main(args):
+    """
+    Construit l'archive donnée en ligne de commande
+    """
+    try:
+        path = build(args[0] if args else None)
+    except OSError as error:
+        print(f"Construction impossible : {error}")
+        return 1
+    pack = LevelPack(path)
+    print(f"{path} : {len(pack.entries)} fichiers, {os.path.getsize(path)} octets")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+
+
+class PerfStats:
+    def __init__(self, window=1.0):
+        """
+        Statistiques de performance du jeu, publiées à chaque fin de fenêtre de mesure
+        window: durée d'une fenêtre de mesure (secondes)
+        Les mesures de simulation viennent de la boucle principale, celles d'affichage
+        du thread d'affichage : chacune a ses propres compteurs
+        """
+        self.window = window
+
+        # Simulation (boucle principale)
+        self.tick_start = time.monotonic()
+        self.ticks = 0
+        self.tick_total = 0
+        self.tick_max = 0
+        self.enemies_total = 0
+        self.tick_rate = 0  # Pas de simulation par seconde
+        self.tick_avg = 0  # Durée moyenne d'un pas (secondes)
+        self.tick_worst = 0  # Durée du pas le plus long (secondes)
+        self.enemies = 0  # Ennemis mis à jour par pas
+
+        # Affichage (thread d'affichage)
+        self.frame_start = time.monotonic()
+        self.frames = 0
+        self.render_total = 0
+        self.bytes_total = 0
+        self.frame_rate = 0  # Images par seconde
+        self.render_avg = 0  # Durée moyenne d'une image (secondes)
+        self.bytes_per_frame = 0  # Octets envoyés par image
+
+    def record_tick(self, duration, enemies_updated):
+        """
+        Enregistre un pas de simulation
+        Retourne True si de nouvelles valeurs viennent d'être publiées
+        """
+        self.ticks += 1
+        self.tick_total += duration
+        self.tick_max = max(self.tick_max, duration)
+        self.enemies_total += enemies_updated
+
+        now = time.monotonic()
+        elapsed = now - self.tick_start
+        if elapsed < self.window:
+            return False
+
+        self.tick_rate = self.ticks / elapsed
+        self.tick_avg = self.tick_total / self.ticks
+        self.tick_worst = self.tick_max
+        self.enemies = self.enemies_total / self.ticks
+
+        self.tick_start = now
+        self.ticks = 0
+        self.tick_total = 0
+        self.tick_max = 0
+        self.enemies_total = 0
+        return True
+
+    def record_frame(self, duration, nbytes):
+        """
+        Enregistre une image affichée
+        """
+        self.frames += 1
+        self.render_total += duration
+        self.bytes_total += nbytes
+
+        now = time.monotonic()
+        elapsed = now - self.frame_start
+        if elapsed < self.window:
+            return
+
+        self.frame_rate = self.frames / elapsed
+        self.render_avg = self.render_total / self.frames
+        self.bytes_per_frame = self.bytes_total / self.frames
+
+        self.frame_start = now
+        self.frames = 0
+        self.render_total = 0
+        self.bytes_total = 0
+
+    def summary(self):
+        """
+        Résumé d'une ligne pour l'affichage en jeu
+        """
+        return (f"Perf | Simulation: {self.tick_rate:.0f} pas/s, moy {self.tick_avg * 1000:.2f} ms, "
+                f"max {self.tick_worst * 1000:.2f} ms | Rendu: {self.frame_rate:.0f} img/s, "
+                f"{self.render_avg * 1000:.2f} ms, {self.bytes_per_frame:.0f} o/img | Ennemis: {self.enemies:.0f}")
@@ -1,17 +1,32 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import sys
+from Tile import BLOCKING
+
+# Physique en virgule fixe : une case est découpée en SUBTILE unités entières
+# Les vitesses du jeu (demi-cases) y sont exactes et les calculs reproductibles au bit près
+SUBTILE_SHIFT = 8
+SUBTILE = 1 << SUBTILE_SHIFT
+GRAVITY_STEP = SUBTILE // 2  # Accélération de la gravité à chaque pas : une demi-case
+MAX_FALL_SPEED = 2 * SUBTILE  # Vitesse de chute maximale : deux cases par pas
 
 
 class Player:
-    def __init__(self, x, y):
+    # Attributs fixés à l'avance : pas de dictionnaire par joueur, accès plus rapide
+    __slots__ = ('x', 'y', 'speed', 'velocity_y', 'gravity', 'on_ground', 'jump_power', 'jump_cooldown',
+                 '_last_x', 'fixed_point', 'sub_y')
+
+    color = "\033[32m"  # Couleur verte, commune à tous les joueurs
+
+    def __init__(self, x, y, fixed_point=False):
         """
         Initialise un joueur
+        fixed_point: position et vitesse verticales en entiers (SUBTILE unités par case),
+        sinon en nombres à virgule flottante
         """
-        self.x = x
-        self.y = y
-        self.color = "\033[32m"  # Couleur verte
+        self.fixed_point = fixed_point
+        self.sub_y = None  # Position verticale en unités de virgule fixe (mode virgule fixe)
+        self.set_pos(x, y)
         self.speed = 1
         self.velocity_y = 0
         self.gravity = 1  # 1 pour gravité vers le bas, -1 pour gravité vers le haut
@@ -24,8 +39,14 @@ class Player:
         """
         Définit la position du joueur
         """
-        self.x = x
-        self.y = y
+        if self.fixed_point:
+            # En virgule fixe, x et y restent des cases entières
+            self.x = int(x)
+            self.y = int(y)
+            self.sub_y = self.y << SUBTILE_SHIFT
+        else:
+            self.x = x
+            self.y = y
 
     def get_pos(self):
         """
@@ -55,7 +76,10 @@ class Player:
         self.gravity *= -1
 
         # Ajuster la vitesse pour un petit effet de poussée dans la nouvelle direction
-        self.velocity_y = self.jump_power * self.gravity * 0.5
+        if self.fixed_point:
+            self.velocity_y = self.jump_power * self.gravity * SUBTILE // 2
+        else:
+            self.velocity_y = self.jump_power * self.gravity * 0.5
         self.on_ground = False
         self.jump_cooldown = 5  # Éviter les changements multiples trop rapides
 
@@ -63,14 +87,9 @@ class Player:
         """
         Permet de ramasser la clé
         """
-        key = game_data.key
-
-        # Convertir en entiers pour la comparaison
-        px, py = int(self.x), int(self.y)
-        kx, ky = int(key.x), int(key.y)
-
-        # Si le joueur est à proximité de la clé
-        if abs(px - kx) <= 1 and abs(py - ky) <= 1 and not game_data.has_key:
+        # Si le joueur est à proximité de la clé : elle est sur sa case ou une case voisine
+        nearby = game_data.occupancy.near(int(self.x), int(self.y))
+        if game_data.key in nearby and not game_data.has_key:
             game_data.has_key = True
             game_data.score += 100 * (game_data.lives / 5)
 
@@ -84,16 +103,56 @@ class Player:
         """
         Teste s'il y a une collision à la position donnée
         """
-        # Convertir en entiers pour indexation
-        x_int = int(x)
-        y_int = int(y)
+        # Une case hors du niveau bloque comme un mur
+        # Note: '+' (téléporteur) ne bloque pas le mouvement, donc on ne le traite pas comme une collision
+        return bool(level.flag(int(x), int(y)) & BLOCKING)
 
-        if x_int < 0 or y_int < 0 or y_int >= len(level.grille) or x_int >= len(level.grille[y_int]):
-            return True
+    def sweep(self, x, y, next_y, level):
+        """
+        Calcule la position verticale atteinte en allant de y vers next_y dans la colonne x
+        La première ligne bloquante sur le trajet est lue dans les tables d'atterrissage du niveau :
+        si le trajet l'atteint, le joueur s'arrête à son point de contact (juste au-dessus d'elle
+        en descendant, au bord de la case suivante en montant), sinon il arrive en next_y
+        Toutes les lignes traversées comptent : un grand pas ne peut pas sauter par-dessus un mur
+        """
+        row = int(y)
+        if next_y > y:
+            blocked = level.landing(int(x), row, 1)
+            if int(next_y) < blocked:
+                return next_y
+            contact = blocked - 1 / SUBTILE  # Même point de contact qu'en virgule fixe
+        else:
+            blocked = level.landing(int(x), row, -1)
+            if int(next_y) > blocked:
+                return next_y
+            contact = blocked + 1
 
-        cell = level.grille[y_int][x_int]
-        # Note: '+' (téléporteur) ne bloque pas le mouvement, donc on ne le traite pas comme une collision
-        return cell == '#' or cell == '='
+        # Départ depuis une case bloquante (entrée par un mouvement horizontal) : ne pas bouger
+        if self.test_collision(x, y, level):
+            return y
+        return contact
+
+    def sweep_fixed(self, x, row, next_sub_y, level):
+        """
+        Équivalent de sweep en virgule fixe : position atteinte en allant de la ligne row
+        vers next_sub_y (en unités de virgule fixe) dans la colonne x
+        """
+        next_row = next_sub_y >> SUBTILE_SHIFT
+        if self.velocity_y > 0:
+            blocked = level.landing(x, row, 1)
+            if next_row < blocked:
+                return next_sub_y
+            contact = (blocked << SUBTILE_SHIFT) - 1  # Juste au-dessus de la ligne bloquante
+        else:
+            blocked = level.landing(x, row, -1)
+            if next_row > blocked:
+                return next_sub_y
+            contact = (blocked + 1) << SUBTILE_SHIFT
+
+        # Départ depuis une case bloquante (entrée par un mouvement horizontal) : ne pas bouger
+        if level.flag(x, row) & BLOCKING:
+            return self.sub_y
+        return contact
 
     def collide(self, game_data):
         """
@@ -101,10 +160,10 @@ class Player:
         """
         level = game_data.levels[game_data.level - 1]
 
-        # Vérifier la collision dans la direction de la gravité
-        test_y = self.y + self.gravity
-
-        if self.test_collision(self.x, test_y, level):
+        # Vérifier la collision dans la direction de la gravité :
+        # le joueur est au sol si la case bloquante la plus proche est la case voisine
+        row = int(self.y)
+        if level.landing(int(self.x), row, self.gravity) == row + self.gravity:
             self.on_ground = True
             self.velocity_y = 0
         else:
@@ -113,16 +172,9 @@ class Player:
         # Vérifier les collisions verticales (en fonction de la gravité)
         if self.velocity_y != 0:  # Si en mouvement vertical
             next_y = self.y + self.velocity_y
-            if not self.test_collision(self.x, next_y, level):
-                self.y = next_y
-            else:
-                # Trouver la position valide la plus proche
-                if self.velocity_y > 0:
-                    while self.test_collision(self.x, self.y + 0.1, level) == False and abs(self.y - next_y) > 0.1:
-                        self.y += 0.1
-                else:
-                    while self.test_collision(self.x, self.y - 0.1, level) == False and abs(self.y - next_y) > 0.1:
-                        self.y -= 0.1
+            self.y = self.sweep(self.x, self.y, next_y, level)
+            if self.y != next_y:
+                # Arrêté contre une case bloquante sur le trajet
                 self.velocity_y = 0
 
         # Vérifier les collisions horizontales APRÈS le mouvement à gauche/droite
@@ -138,20 +190,68 @@ class Player:
         # Mémoriser la position actuelle pour le prochain cycle
         self._last_x = self.x
 
-        # Vérifier les bords de l'écran
+        # Vérifier les bords du niveau
         if self.x < 0:
             self.x = 0
-        if self.x > game_data.x_max:
-            self.x = game_data.x_max
+        if self.x > level.width - 1:
+            self.x = level.width - 1
         if self.y < 0:
             self.y = 0
-        if self.y > game_data.y_max - 1:
-            self.y = game_data.y_max - 1
+        if self.y > level.height - 1:
+            self.y = level.height - 1
+
+    def collide_fixed(self, game_data):
+        """
+        Gère les collisions avec le niveau en virgule fixe : x et y restent des cases entières,
+        seule sub_y porte la partie fractionnaire de la position verticale
+        """
+        level = game_data.levels[game_data.level - 1]
+        x = self.x
+        row = self.y
+
+        # Au sol si la case bloquante la plus proche dans le sens de la gravité est la case voisine
+        if level.landing(x, row, self.gravity) == row + self.gravity:
+            self.on_ground = True
+            self.velocity_y = 0
+        else:
+            self.on_ground = False
+
+        # Collisions verticales
+        if self.velocity_y != 0:
+            next_sub_y = self.sub_y + self.velocity_y
+            self.sub_y = self.sweep_fixed(x, row, next_sub_y, level)
+            if self.sub_y != next_sub_y:
+                # Arrêté contre une case bloquante sur le trajet
+                self.velocity_y = 0
+
+        # Collisions horizontales après le mouvement à gauche/droite
+        if self._last_x is not None and x != self._last_x:
+            if level.flag(x, self.sub_y >> SUBTILE_SHIFT) & BLOCKING:
+                self.x = self._last_x
+        self._last_x = self.x
+
+        # Bords du niveau
+        if self.x < 0:
+            self.x = 0
+        if self.x > level.width - 1:
+            self.x = level.width - 1
+        if self.sub_y < 0:
+            self.sub_y = 0
+        if self.sub_y > (level.height - 1) << SUBTILE_SHIFT:
+            self.sub_y = (level.height - 1) << SUBTILE_SHIFT
+
+        self.y = self.sub_y >> SUBTILE_SHIFT
 
     def update(self, game_data):
         """
         Met à jour l'état du joueur
+        Retourne True si son apparence à l'écran a changé
         """
+        if self.fixed_point:
+            return self.update_fixed(game_data)
+
+        old_look = (int(self.x), int(self.y), self.gravity)
+
         # Appliquer la gravité
         if not self.on_ground:
             self.velocity_y += 0.5 * self.gravity
@@ -168,7 +268,36 @@ class Player:
         # Gérer les collisions
         self.collide(game_data)
 
-    def show(self):
+        return (int(self.x), int(self.y), self.gravity) != old_look
+
+    def update_fixed(self, game_data):
+        """
+        Met à jour l'état du joueur en virgule fixe : uniquement des calculs entiers,
+        les mêmes entrées donnent toujours exactement la même trajectoire
+        Retourne True si son apparence à l'écran a changé
+        """
+        old_look = (self.x, self.y, self.gravity)
+
+        # Appliquer la gravité
+        if not self.on_ground:
+            self.velocity_y += GRAVITY_STEP * self.gravity
+
+        # Limiter la vitesse de chute
+        if self.velocity_y > MAX_FALL_SPEED:
+            self.velocity_y = MAX_FALL_SPEED
+        elif self.velocity_y < -MAX_FALL_SPEED:
+            self.velocity_y = -MAX_FALL_SPEED
+
+        # Décrémenter le compteur de saut
+        if self.jump_cooldown > 0:
+            self.jump_cooldown -= 1
+
+        # Gérer les collisions
+        self.collide_fixed(game_data)
+
+        return (self.x, self.y, self.gravity) != old_look
+
+    def show(self, renderer):
         """
         Affiche le joueur
         """
@@ -179,4 +308,4 @@ class Player:
         # Caractère différent selon la direction de la gravité
         char = '?' if self.gravity > 0 else '¿'
 
-        sys.stdout.write(f"\033[{y + 1};{x + 1}H{self.color}{char}\033[0m")
\ No newline at end of file
+        renderer.put(x, y, char, self.color)
\ No newline at end of file
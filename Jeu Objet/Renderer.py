@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from Target import TerminalTarget
+
+# Cellule vide : (caractère, couleur)
+BLANK = (' ', "")
+
+# Au-delà de cette distance, réécrire les cases intermédiaires coûte plus cher
+# qu'un déplacement relatif du curseur
+MAX_REPRINT = 4
+
+
+def relative(n, forward, backward):
+    """
+    Séquence de déplacement relatif du curseur de n cases (le 1 est implicite)
+    """
+    if n == 0:
+        return ""
+    command = forward if n > 0 else backward
+    n = abs(n)
+    return f"\033[{command}" if n == 1 else f"\033[{n}{command}"
+
+
+def absolute(x, y):
+    """
+    Séquence de positionnement absolu du curseur (coordonnées à partir de 0)
+    """
+    if x == 0:
+        return "\033[H" if y == 0 else f"\033[{y + 1}H"
+    return f"\033[{y + 1};{x + 1}H"
+
+
+class Renderer:
+    def __init__(self, width, height, target=None, coalesce=True):
+        """
+        Crée un moteur de rendu à double tampon
+        Le tampon arrière reçoit l'image en cours de construction,
+        le tampon avant garde ce qui a réellement été envoyé au terminal
+        target: destination des images (terminal par défaut, voir Target.py)
+        coalesce: regroupe les cellules voisines de même couleur sous un seul code couleur
+        """
+        self.target = target if target is not None else TerminalTarget()
+        self.coalesce = coalesce
+        self.frame = []  # Morceaux de l'image en cours, réutilisé d'une image à l'autre
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        """
+        Change la taille de l'écran : les tampons sont recréés et l'écran sera effacé puis redessiné
+        La fenêtre sur le niveau occupe tout l'écran tant que set_view() ne la change pas
+        """
+        self.width = width
+        self.height = height
+        self.back = [[BLANK] * width for _ in range(height)]
+        self.front = [[None] * width for _ in range(height)]
+        self.clear_screen = True  # Effacer l'écran avant la prochaine image
+        self.set_view(0, 0, width, height)
+
+    def set_view(self, x, y, width, height):
+        """
+        Définit la fenêtre du niveau affichée en haut à gauche de l'écran
+        (x, y): première case visible du niveau, width/height: taille de la fenêtre
+        """
+        self.view_x = x
+        self.view_y = y
+        self.view_width = min(width, self.width)
+        self.view_height = min(height, self.height)
+
+    def clear(self):
+        """
+        Vide le tampon arrière avant de construire une nouvelle image
+        """
+        for row in self.back:
+            row[:] = [BLANK] * self.width
+
+    def invalidate(self):
+        """
+        Oublie le contenu du terminal (après un effacement d'écran par exemple)
+        pour forcer un réaffichage complet à la prochaine image
+        """
+        for row in self.front:
+            row[:] = [None] * self.width
+
+    def put(self, x, y, char, color=""):
+        """
+        Dessine un caractère du niveau dans le tampon arrière
+        (x, y) sont des coordonnées du niveau : ce qui sort de la fenêtre n'est pas dessiné
+        """
+        x -= self.view_x
+        y -= self.view_y
+        if 0 <= y < self.view_height and 0 <= x < self.view_width:
+            self.back[y][x] = (char, color)
+
+    def blit(self, rows):
+        """
+        Recopie la partie visible de lignes de cellules pré-calculées (le décor du niveau)
+        dans le tampon arrière
+        """
+        left = self.view_x
+        right = left + self.view_width
+        for y, row in enumerate(rows[self.view_y:self.view_y + self.view_height]):
+            part = row[left:right]
+            self.back[y][:len(part)] = part
+
+    def text(self, x, y, string, color=""):
+        """
+        Dessine une chaîne de caractères dans le tampon arrière
+        (x, y) sont des coordonnées de l'écran, la fenêtre sur le niveau ne s'applique pas
+        """
+        if not 0 <= y < self.height:
+            return
+        row = self.back[y]
+        for i, char in enumerate(string[:max(0, self.width - x)]):
+            if x + i >= 0:
+                row[x + i] = (char, color)
+
+    def present(self):
+        """
+        Envoie au terminal uniquement les cellules qui ont changé depuis la dernière image
+        L'image est assemblée dans un seul tampon puis écrite en une fois
+        Retourne le nombre d'octets envoyés
+        """
+        frame = self.frame
+        frame.clear()
+        coalesce = self.coalesce
+
+        if self.clear_screen:
+            frame.append("\033[2J")
+            self.clear_screen = False
+
+        current = ""  # Couleur active sur le terminal
+        cursor = None  # Position du curseur après le dernier caractère écrit
+
+        for y in range(self.height):
+            back_row = self.back[y]
+            front_row = self.front[y]
+
+            # Ligne identique : rien à envoyer
+            if back_row == front_row:
+                continue
+
+            for x in range(self.width):
+                cell = back_row[x]
+                if cell != front_row[x]:
+                    char, color = cell
+                    # Pas de positionnement si la cellule suit directement la précédente
+                    if cursor != (x, y):
+                        frame.append(self.move_cursor(cursor, x, y, front_row, current))
+                    if coalesce:
+                        # Pas de changement de couleur tant qu'elle reste identique
+                        if color != current:
+                            if current:
+                                frame.append("\033[0m")
+                            frame.append(color)
+                            current = color
+                        frame.append(char)
+                    elif color:
+                        frame.append(f"{color}{char}\033[0m")
+                    else:
+                        frame.append(char)
+                    front_row[x] = cell
+
+                    # Après la dernière colonne, la position du curseur dépend du terminal
+                    cursor = (x + 1, y) if x + 1 < self.width else None
+
+        # Toujours rendre le terminal avec les attributs par défaut
+        if current:
+            frame.append("\033[0m")
+
+        if not frame:
+            return 0
+
+        data = "".join(frame).encode('utf-8')
+        self.target.write(data)
+        return len(data)
+
+    def move_cursor(self, cursor, x, y, row, current):
+        """
+        Choisit la séquence la plus courte pour amener le curseur en (x, y)
+        cursor: position actuelle du curseur, None si elle est inconnue
+        row: ligne y du tampon avant, pour réécrire les cases entre le curseur et la cible
+        current: couleur active, les cases réécrites doivent avoir cette couleur
+        """
+        best = absolute(x, y)
+        if cursor is None:
+            return best
+
+        cursor_x, cursor_y = cursor
+        vertical = relative(y - cursor_y, 'B', 'A')
+
+        # Déplacements horizontaux possibles depuis la colonne du curseur
+        moves = [relative(x - cursor_x, 'C', 'D'), "\r" + relative(x, 'C', 'D')]
+        if 0 < x - cursor_x <= MAX_REPRINT:
+            # Réécrire les cases intermédiaires, déjà à jour à l'écran, si elles ont la couleur active
+            cells = row[cursor_x:x]
+            if all(color == current for _, color in cells):
+                moves.append("".join(char for char, _ in cells))
+
+        for move in moves:
+            sequence = vertical + move
+            if len(sequence.encode('utf-8')) < len(best.encode('utf-8')):
+                best = sequence
+        return best
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Effacement de l'écran avant d'afficher un écran du jeu
+CLEAR = "\033[H\033[2J"
+
+# Instructions affichées sous le titre du menu principal
+MENU_INSTRUCTIONS = (
+    "\033[19;25H\033[1;33m╔════════════════════════════════════════╗\033[0m"
+    "\033[20;25H\033[1;33m║               INSTRUCTIONS             ║\033[0m"
+    "\033[21;25H\033[1;33m╚════════════════════════════════════════╝\033[0m"
+    "\033[23;25H[S]: Sortie | [?/¿]: Joueur | [K]: clé"
+    "\033[24;25H[E]: Ennemi rouge (actif en gravité normale)"
+    "\033[25;25H[F]: Ennemi jaune (actif en gravité inversée)"
+    "\033[27;25H\033[1;32m[Entrée]: Jouer | [h]: Scores | [Echap]: Quitter\033[0m"
+)
+
+
+def render(text, color, fallback):
+    """
+    Prépare le dessin du texte d'un écran : chaque ligne est placée à partir de la ligne 2
+    du terminal dans la couleur donnée
+    fallback: séquence affichée à la place si l'écran n'a pas de texte
+    """
+    if not text:
+        return fallback
+    return "".join(color + f"\033[{i + 2};1H{line}" + "\033[0;0m" for i, line in enumerate(text.split('\n')))
+
+
+class Screens:
+    def __init__(self, pack):
+        """
+        Écrans du jeu (menu principal, fin de partie, victoire) préparés une seule fois au démarrage
+        Chaque écran est une suite d'octets prête à être écrite d'un coup sur le terminal :
+        plus de lecture de fichier ni de mise en couleur au moment de l'afficher
+        pack: paquet de niveaux où lire le texte des écrans (voir LevelPack.py),
+        un texte de remplacement est choisi ici si l'un d'eux manque
+        """
+        self.menu = (CLEAR
+                     + render(pack.screen('menu'), "\033[1;36m", "\033[10;30HZZZZZZ")
+                     + MENU_INSTRUCTIONS).encode('utf-8')
+        self.game_over = (CLEAR
+                          + render(pack.screen('game_over'), "\033[1;31m",
+                                   "\033[10;30H\033[31mGAME OVER\033[0m")).encode('utf-8')
+        self.victory = (CLEAR
+                        + render(pack.screen('victory'), "\033[1;32m",
+                                 "\033[1;32m" + "\033[10;30H\033[32mVICTOIRE!\033[0m" + "\033[0;0m")).encode('utf-8')
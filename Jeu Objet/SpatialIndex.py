@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+class SpatialIndex:
+    def __init__(self):
+        """
+        Crée un index d'occupation des cases : pour chaque case occupée, la liste de ses occupants
+        Il est tenu à jour à chaque déplacement, ce qui évite de parcourir toutes les entités
+        pour savoir qui se trouve sur une case
+        """
+        self.cells = {}  # (x, y) -> occupants
+
+    def add(self, occupant, x, y):
+        """
+        Place un occupant sur la case (x, y)
+        """
+        self.cells.setdefault((x, y), []).append(occupant)
+
+    def remove(self, occupant, x, y):
+        """
+        Retire un occupant de la case (x, y)
+        """
+        occupants = self.cells[(x, y)]
+        # Comparer par identité : deux occupants peuvent être égaux sans être le même
+        for i, other in enumerate(occupants):
+            if other is occupant:
+                del occupants[i]
+                break
+        if not occupants:
+            del self.cells[(x, y)]
+
+    def move(self, occupant, old_x, old_y, x, y):
+        """
+        Déplace un occupant de la case (old_x, old_y) vers la case (x, y)
+        """
+        if old_x == x and old_y == y:
+            return
+
+        cells = self.cells
+        occupants = cells[(old_x, old_y)]
+        if len(occupants) == 1:
+            # Cas courant : l'occupant était seul sur sa case
+            del cells[(old_x, old_y)]
+        else:
+            self.remove(occupant, old_x, old_y)
+
+        occupants = cells.get((x, y))
+        if occupants is None:
+            cells[(x, y)] = [occupant]
+        else:
+            occupants.append(occupant)
+
+    def at(self, x, y):
+        """
+        Récupère les occupants de la case (x, y)
+        """
+        return self.cells.get((x, y), ())
+
+    def near(self, x, y, radius=1):
+        """
+        Récupère les occupants de la case (x, y) et des cases voisines, à radius cases au plus
+        """
+        found = []
+        for ny in range(y - radius, y + radius + 1):
+            for nx in range(x - radius, x + radius + 1):
+                found.extend(self.cells.get((nx, ny), ()))
+        return found
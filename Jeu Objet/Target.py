@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import select
+import shutil
+import sys
+
+# Séquence de contrôle CSI : ESC [ paramètres lettre
+CSI = re.compile(r"\033\[([?0-9;]*)([A-Za-z])")
+
+
+class TerminalTarget:
+    """
+    Destination d'affichage : le vrai terminal (sortie standard)
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+        # Clavier et écran tous deux reliés à un terminal : sinon (sortie redirigée,
+        # service, intégration continue) la partie se joue sans lire de touches
+        self.is_tty = self.stream.isatty() and sys.stdin.isatty()
+
+    def size(self, default_width=160, default_height=24):
+        """
+        Récupère la taille du terminal (colonnes, lignes)
+        """
+        return tuple(shutil.get_terminal_size((default_width, default_height)))
+
+    def ready(self):
+        """
+        Indique si le terminal peut recevoir une image sans bloquer
+        (faux quand la sortie est saturée, par exemple sur une liaison SSH lente)
+        """
+        fd = self.stream.fileno()
+        return bool(select.select([], [fd], [], 0)[1])
+
+    def write(self, data):
+        """
+        Confie une image complète au système en un seul appel d'écriture
+        """
+        # Vider d'abord ce qui a pu être écrit directement sur le flux
+        self.stream.flush()
+
+        fd = self.stream.fileno()
+        view = memoryview(data)
+        while view:
+            # os.write peut n'écrire qu'une partie des octets sur un terminal lent
+            written = os.write(fd, view)
+            view = view[written:]
+
+
+class NullTarget:
+    """
+    Destination d'affichage qui jette tout (jeu sans terminal, mesures de performance)
+    """
+    is_tty = False
+
+    def __init__(self, width=160, height=24):
+        self.width = width
+        self.height = height
+        self.bytes_written = 0
+        self.frames = 0
+
+    def size(self, default_width=160, default_height=24):
+        """
+        Récupère la taille de l'écran simulé (colonnes, lignes)
+        """
+        return (self.width, self.height)
+
+    def ready(self):
+        """
+        Indique si une image peut être envoyée : toujours vrai
+        """
+        return True
+
+    def write(self, data):
+        """
+        Compte les octets reçus sans les afficher
+        """
+        self.bytes_written += len(data)
+        self.frames += 1
+
+
+class MemoryTarget:
+    """
+    Destination d'affichage en mémoire : une grille de caractères qui interprète
+    les séquences de contrôle envoyées par le moteur de rendu comme le ferait un terminal
+    """
+    is_tty = False
+
+    def __init__(self, width=160, height=24):
+        self.width = width
+        self.height = height
+        self.bytes_written = 0
+        self.frames = 0
+        self.cursor_x = 0
+        self.cursor_y = 0
+        self.color = ""  # Couleur active
+        self.grid = []
+        self.colors = []
+        self.clear()
+
+    def size(self, default_width=160, default_height=24):
+        """
+        Récupère la taille de la grille (colonnes, lignes)
+        """
+        return (self.width, self.height)
+
+    def ready(self):
+        """
+        Indique si une image peut être envoyée : toujours vrai
+        """
+        return True
+
+    def clear(self):
+        """
+        Efface toute la grille
+        """
+        self.grid = [[' '] * self.width for _ in range(self.height)]
+        self.colors = [[""] * self.width for _ in range(self.height)]
+
+    def cell(self, x, y):
+        """
+        Récupère le contenu d'une case : (caractère, couleur)
+        """
+        return (self.grid[y][x], self.colors[y][x])
+
+    def lines(self):
+        """
+        Récupère le texte affiché, ligne par ligne
+        """
+        return ["".join(row) for row in self.grid]
+
+    def write(self, data):
+        """
+        Interprète une image envoyée par le moteur de rendu
+        """
+        self.bytes_written += len(data)
+        self.frames += 1
+
+        text = data.decode('utf-8')
+        pos = 0
+        for match in CSI.finditer(text):
+            self.print_text(text[pos:match.start()])
+            self.control(match.group(1), match.group(2), match.group(0))
+            pos = match.end()
+        self.print_text(text[pos:])
+
+    def print_text(self, text):
+        """
+        Écrit des caractères à la position du curseur
+        """
+        for char in text:
+            if char == '\r':
+                self.cursor_x = 0
+            elif char == '\n':
+                self.cursor_y = min(self.cursor_y + 1, self.height - 1)
+            else:
+                if 0 <= self.cursor_y < self.height and 0 <= self.cursor_x < self.width:
+                    self.grid[self.cursor_y][self.cursor_x] = char
+                    self.colors[self.cursor_y][self.cursor_x] = self.color
+                self.cursor_x += 1
+
+    def control(self, params, command, sequence):
+        """
+        Applique une séquence de contrôle (déplacement du curseur, couleur, effacement)
+        """
+        values = [int(value) if value.isdigit() else 0 for value in params.split(';')]
+        n = values[0] or 1
+
+        if command == 'H':  # Position absolue (ligne;colonne), à partir de 1
+            row = values[0] or 1
+            column = values[1] if len(values) > 1 and values[1] else 1
+            self.cursor_y = row - 1
+            self.cursor_x = column - 1
+        elif command == 'A':  # Haut
+            self.cursor_y = max(self.cursor_y - n, 0)
+        elif command == 'B':  # Bas
+            self.cursor_y = min(self.cursor_y + n, self.height - 1)
+        elif command == 'C':  # Droite
+            self.cursor_x = min(self.cursor_x + n, self.width - 1)
+        elif command == 'D':  # Gauche
+            self.cursor_x = max(min(self.cursor_x, self.width - 1) - n, 0)
+        elif command == 'G':  # Colonne absolue
+            self.cursor_x = n - 1
+        elif command == 'm':  # Couleur
+            self.color = "" if not any(values) else sequence
+        elif command == 'K':  # Effacer jusqu'à la fin de la ligne
+            if 0 <= self.cursor_y < self.height:
+                for x in range(self.cursor_x, self.width):
+                    self.grid[self.cursor_y][x] = ' '
+                    self.colors[self.cursor_y][x] = ""
+        elif command == 'J' and values[0] == 2:  # Effacer l'écran
+            self.clear()
+        # Les autres séquences (affichage du curseur...) n'ont pas d'effet sur la grille
@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from Level import Level
+from LevelCache import LevelCache
+from LevelPack import LevelPack
 from Player import Player
 from Key import Key
 from Enemy import Enemy
+from EnemyPool import EnemyPool
 import sys
 import time
 import select
@@ -12,7 +14,18 @@ import termios
 import tty
 import threading
 import os
+import signal
 from Score import ScoreManager
+from Screens import Screens
+from Renderer import Renderer
+from Target import TerminalTarget, NullTarget
+from Camera import Camera
+from Governor import Governor
+from Perf import PerfStats
+from SpatialIndex import SpatialIndex
+
+# Durée par défaut d'une partie sans terminal : une minute de jeu
+HEADLESS_TICKS = 6000
 
 
 
@@ -23,8 +36,11 @@ class GameData:
         Initialise les données du jeu
         """
         self.timeStep = 0.01  # Pas de temps de simulation
-        self.show_period = 0.05  # Période d'affichage plus rapide
-        self.show_time = 0  # Temps écoulé depuis le dernier affichage
+        self.max_steps = 5  # Nombre maximal de pas de simulation rattrapés d'un coup
+        self.show_period = 0.05  # Période d'affichage initiale
+        self.show_period_min = 0.02  # Bornes de la période d'affichage adaptative
+        self.show_period_max = 0.25
+        # Taille d'écran par défaut quand celle du terminal est inconnue
         self.x_min = 0
         self.x_max = 37
         self.y_min = 0
@@ -32,14 +48,29 @@ class GameData:
         self.score = 0
         self.level = 1
         self.lives = 5
-        self.levels = []
+        self.pack = LevelPack()  # Niveaux et écrans du jeu : archive lue en une fois ou fichiers séparés
+        self.levels = LevelCache([])  # Niveaux du jeu, chargés à la demande (voir load_levels)
         self.player = None
+        self.fixed_point = False  # Physique du joueur en entiers (SUBTILE unités par case), sur demande
         self.enemies = []  # Liste d'ennemis
+        self.active_enemies = []  # Ennemis qui se déplacent avec la gravité actuelle du joueur
+        self.dormant_enemies = []  # Ennemis suspendus, qui ne coûtent rien à chaque pas
+        self.enemies_gravity = None  # Gravité pour laquelle les ennemis ont été répartis
+        self.pooled_enemies = False  # Ranger les ennemis en tableaux (niveaux très peuplés)
+        self.enemy_pool = None  # Ennemis rangés en tableaux, à la place de la liste
+        self.occupancy = SpatialIndex()  # Ennemis de la liste et clé, par case
         self.key = None
         self.running = True
         self.has_key = False
         self.old_settings = None
-        self.display_lock = threading.Lock()  # Verrou pour synchroniser l'affichage
+        # Verrou pour synchroniser l'affichage, réentrant car le signal de redimensionnement
+        # du terminal peut interrompre le thread principal pendant qu'il le détient
+        self.display_lock = threading.RLock()
+        self.display_cond = threading.Condition(self.display_lock)  # Réveille le thread d'affichage
+        self.dirty = True  # L'image affichée n'est plus à jour
+        self.urgent = False  # Réafficher sans attendre la période d'affichage
+        self.resized = False  # Le terminal a changé de taille
+        self.show_perf = False  # Afficher les statistiques de performance
         self.victory = False  # indicateur de victoire
 
         # Variables pour les niveaux secrets
@@ -48,48 +79,30 @@ class GameData:
         self.secret_level = None
         self.saved_level = None
 
+    def mark_dirty(self, urgent=False):
+        """
+        Signale au thread d'affichage que l'état du jeu a changé
+        urgent: afficher tout de suite (réponse à une touche) sans attendre la période d'affichage
+        """
+        with self.display_cond:
+            self.dirty = True
+            self.urgent = self.urgent or urgent
+            self.display_cond.notify()
+
+    def stop(self):
+        """
+        Arrête la partie et réveille le thread d'affichage pour qu'il se termine
+        """
+        with self.display_cond:
+            self.running = False
+            self.display_cond.notify_all()
+
     def load_levels(self):
         """
-        Charge tous les niveaux du jeu
-        """
-        level_files = [
-            "niveau-00.txt",
-            "niveau-01.txt",
-            "niveau-02.txt",
-            "niveau-03.txt",
-            "niveau-04.txt",
-            "niveau-05.txt",
-            "niveau-06.txt",
-            "niveau-07.txt",
-            "niveau-08.txt",
-            "niveau-09.txt"
-        ]
-
-        for level_file in level_files:
-            level = Level(level_file, 0)
-            self.levels.append(level)
-
-    def extract_positions_from_level(self, level):
-        """
-        Extrait les positions des éléments depuis un niveau
-        """
-        player_pos = None
-        key_pos = None
-        enemy_positions = []
-        inverted_enemy_positions = []
-
-        for y, line in enumerate(level.grille):
-            for x, char in enumerate(line):
-                if char == '@':
-                    player_pos = (x, y)
-                elif char == 'K':
-                    key_pos = (x, y)
-                elif char == 'E':
-                    enemy_positions.append((x, y))
-                elif char == 'F':  # Ennemi de type 2 (gravité inversée)
-                    inverted_enemy_positions.append((x, y))
-
-        return player_pos, key_pos, enemy_positions, inverted_enemy_positions
+        Prépare la liste des niveaux du jeu
+        Chaque niveau n'est chargé qu'au moment où il est joué, le suivant en arrière-plan
+        """
+        self.levels = LevelCache(self.pack.levels(), pack=self.pack)
 
     def initialize_level_entities(self, level=None):
         """
@@ -100,31 +113,65 @@ class GameData:
         else:
             current_level = level
 
-        player_pos, key_pos, enemy_positions, inverted_enemy_positions = self.extract_positions_from_level(
-            current_level)
+        # Positions lues dans la table d'apparition du niveau, calculée à son chargement
+        spawns = current_level.spawns
 
         # Créer le joueur
-        if player_pos:
-            self.player = Player(player_pos[0], player_pos[1])
-        else:
-            self.player = Player(5, 5)  # Position par défaut
+        player_x, player_y = current_level.player_spawn()
+        self.player = Player(player_x, player_y, self.fixed_point)
 
         # Créer la clé
-        if key_pos:
-            self.key = Key(key_pos[0], key_pos[1])
-        else:
-            self.key = Key(20, 20)  # Position par défaut
+        key_x, key_y = spawns['key'] or (20, 20)  # Position par défaut
+        self.key = Key(key_x, key_y)
 
         # Vider la liste des ennemis existants
         self.enemies.clear()
 
-        # Créer les ennemis standard
-        for pos in enemy_positions:
-            self.enemies.append(Enemy(pos[0], pos[1], 1))
+        # Créer les ennemis, standard puis de gravité inversée, avec leur patrouille déjà calculée
+        for x, y, enemy_type, min_x, max_x in spawns['enemies']:
+            self.enemies.append(Enemy(x, y, enemy_type, bounds=(min_x, max_x)))
+
+        # Ranger les ennemis en tableaux si la partie le demande
+        self.enemy_pool = None
+        if self.pooled_enemies:
+            self.enemy_pool = EnemyPool(current_level, self.enemies)
+            self.enemies.clear()
 
-        # Créer les ennemis de gravité inversée
-        for pos in inverted_enemy_positions:
-            self.enemies.append(Enemy(pos[0], pos[1], 2))
+        # Répartir les ennemis entre actifs et suspendus selon la gravité du joueur
+        self.enemies_gravity = None
+        self.sort_enemies(self.player.gravity)
+
+        # Index d'occupation des cases, tenu à jour par les déplacements des ennemis
+        self.occupancy = SpatialIndex()
+        for enemy in self.enemies:
+            self.occupancy.add(enemy, enemy.x, enemy.y)
+        self.occupancy.add(self.key, int(self.key.x), int(self.key.y))
+
+        # Charger le niveau suivant pendant que celui-ci est joué
+        self.levels.prefetch(self.level)
+
+    def sort_enemies(self, gravity):
+        """
+        Répartit les ennemis entre actifs et suspendus selon la gravité du joueur
+        Ne fait rien tant que la gravité ne change pas ; quand elle s'inverse, les ennemis
+        suspendus deviennent exactement les actifs et inversement : il suffit d'échanger les listes
+        Retourne True si l'apparence des ennemis a changé
+        """
+        if gravity == self.enemies_gravity:
+            return False
+
+        if self.enemies_gravity is None:
+            self.active_enemies = [enemy for enemy in self.enemies if enemy.is_active_for(gravity)]
+            self.dormant_enemies = [enemy for enemy in self.enemies if not enemy.is_active_for(gravity)]
+        else:
+            self.active_enemies, self.dormant_enemies = self.dormant_enemies, self.active_enemies
+        self.enemies_gravity = gravity
+
+        for enemy in self.active_enemies:
+            enemy.state = 0  # Actif
+        for enemy in self.dormant_enemies:
+            enemy.state = 1  # Inactif (affiché en gris)
+        return True
 
     def change_to_secret_level(self):
         """
@@ -138,14 +185,11 @@ class GameData:
         secret_level_name = f"niveau-secret-{self.level - 1:02d}.txt"
 
         # Si le niveau secret n'existe pas, utiliser le fichier niveau-secret-01.txt
-        try:
-            with open(secret_level_name, 'r', encoding='utf-8') as f:
-                pass
-        except FileNotFoundError:
+        if not self.pack.exists(secret_level_name):
             secret_level_name = "niveau-secret-01.txt"
 
         # Créer le niveau secret
-        secret_level = Level(secret_level_name, 0)
+        secret_level = self.pack.level(secret_level_name)
 
         # Remplacer temporairement le niveau actuel par le niveau secret
         self.current_is_secret = True
@@ -183,13 +227,8 @@ class GameData:
         """
         Remet le joueur à sa position initiale du niveau
         """
-        current_level = self.levels[self.level - 1]
-        player_pos, _, _, _ = self.extract_positions_from_level(current_level)
-
-        if player_pos:
-            self.player.set_pos(player_pos[0], player_pos[1])
-        else:
-            self.player.set_pos(5, 5)
+        player_x, player_y = self.levels[self.level - 1].player_spawn()
+        self.player.set_pos(player_x, player_y)
 
         # Réinitialiser la gravité et la vitesse
         self.player.gravity = 1
@@ -197,12 +236,20 @@ class GameData:
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, target=None):
         """
         Initialise le jeu
+        target: destination de l'affichage (terminal par défaut,
+                NullTarget ou MemoryTarget pour jouer sans terminal, voir Target.py)
         """
         self.data = GameData()
+        self.screens = Screens(self.data.pack)  # Écrans du menu, de fin et de victoire
         self.score_manager = ScoreManager()
+        self.target = target if target is not None else TerminalTarget()
+        self.renderer = None
+        self.camera = None
+        self.governor = None
+        self.perf = PerfStats()
 
     def init(self):
         """
@@ -214,18 +261,56 @@ class Game:
         # Initialiser les entités du premier niveau
         self.data.initialize_level_entities()
 
-        # Configuration du terminal pour la détection des touches sans appuyer sur Entrée
-        self.data.old_settings = termios.tcgetattr(sys.stdin)
-        tty.setraw(sys.stdin.fileno())
+        if self.target.is_tty:
+            # Configuration du terminal pour la détection des touches sans appuyer sur Entrée
+            self.data.old_settings = termios.tcgetattr(sys.stdin)
+            tty.setraw(sys.stdin.fileno())
 
-        # Effacer l'écran et cacher le curseur
-        sys.stdout.write("\033[2J\033[?25l")
-        sys.stdout.flush()
+            # Effacer l'écran et cacher le curseur
+            sys.stdout.write("\033[2J\033[?25l")
+            sys.stdout.flush()
+
+            # Recalculer la mise en page quand le terminal change de taille
+            signal.signal(signal.SIGWINCH, self.on_resize)
+
+        # Moteur de rendu et caméra à la taille de l'écran
+        self.layout()
+
+        # Cadence d'affichage adaptée au coût de chaque image
+        self.governor = Governor(self.data.show_period, self.data.show_period_min, self.data.show_period_max)
+
+    def layout(self):
+        """
+        Adapte le moteur de rendu et la caméra à la taille de l'écran
+        """
+        columns, rows = self.target.size(160, self.data.y_max)
+
+        if self.renderer is None:
+            self.renderer = Renderer(columns, rows, self.target)
+        else:
+            self.renderer.resize(columns, rows)
+
+        # La dernière ligne de l'écran est réservée aux informations du jeu
+        if self.camera is None:
+            self.camera = Camera(columns, rows - 1)
+        else:
+            self.camera.resize(columns, rows - 1)
+
+    def on_resize(self, signum, frame):
+        """
+        Réagit au redimensionnement du terminal (SIGWINCH)
+        """
+        self.data.resized = True
+        self.data.mark_dirty(urgent=True)
 
     def is_data(self):
         """
         Indique s'il y a des événements en attente
         """
+        # Sans terminal, il n'y a pas de clavier à lire
+        if not self.target.is_tty:
+            return False
+
         return select.select([sys.stdin], [], [], 0) == ([sys.stdin], [], [])
 
     def interact(self):
@@ -241,41 +326,55 @@ class Game:
             elif c == 'q':  # Déplacer à gauche
                 self.data.player.move_left()
                 # Afficher immédiatement après le déplacement
-                with self.data.display_lock:
-                    self.show()
+                self.data.mark_dirty(urgent=True)
             elif c == 'd':  # Déplacer à droite
                 self.data.player.move_right()
                 # Afficher immédiatement après le déplacement
-                with self.data.display_lock:
-                    self.show()
+                self.data.mark_dirty(urgent=True)
             elif c == 'z' or c == ' ':  # Changer la gravité
                 self.data.player.gravity_change()
                 # Afficher immédiatement après le changement de gravité
                 self.data.score -= 1
-                with self.data.display_lock:
-                    self.show()
+                self.data.mark_dirty(urgent=True)
             elif c == 'e':  # Essayer de ramasser la clé
                 self.data.player.pick_key(self.data)
                 # Afficher immédiatement après la tentative de ramassage
-                with self.data.display_lock:
-                    self.show()
+                self.data.mark_dirty(urgent=True)
+            elif c == 'p':  # Afficher/masquer les statistiques de performance
+                self.data.show_perf = not self.data.show_perf
+                self.data.mark_dirty(urgent=True)
             elif c == 'r':  # Redémarrer le niveau actuel
                 self.data.reset_player_position()
                 # Réinitialiser la clé
                 self.data.has_key = False
-                with self.data.display_lock:
-                    self.show()
+                self.data.mark_dirty(urgent=True)
 
     def live(self):
         """
         Simule l'évolution du jeu sur un pas de temps
         """
-        # Mise à jour du joueur
-        self.data.player.update(self.data)
+        start = time.perf_counter()
 
-        # Mise à jour des ennemis
-        for enemy in self.data.enemies:
-            enemy.update(self.data)
+        # Mise à jour du joueur
+        changed = self.data.player.update(self.data)
+
+        # Réveiller et suspendre les ennemis si la gravité s'est inversée
+        if self.data.sort_enemies(self.data.player.gravity):
+            changed = True
+
+        # Mise à jour des ennemis actifs, les ennemis suspendus ne coûtent rien
+        updated = 0
+        for enemy in self.data.active_enemies:
+            updated += 1
+            if enemy.update(self.data):
+                changed = True
+
+        # Ennemis rangés en tableaux : tous les actifs mis à jour en une passe
+        pool = self.data.enemy_pool
+        if pool is not None:
+            if pool.update(self.data.player.gravity):
+                changed = True
+            updated += pool.active_count()
 
         # Vérifier si le joueur a atteint la sortie
         current_level = self.data.levels[self.data.level - 1]
@@ -284,49 +383,89 @@ class Game:
                 self.data.change_to_next_level()
             else:
                 self.win()
+            changed = True
 
         # Vérifier si le joueur a atteint la sortie secrète
         if current_level.check_secret_exit(self.data.player, self.data):
             self.data.score += 10000
             self.data.change_to_secret_level()
-
-        # Vérifier les collisions entre le joueur et les ennemis
-        for enemy in self.data.enemies:
-            if enemy.test_player_collision(self.data.player):
-                if enemy.state == 0:  # Ne tester que les ennemis actifs
-                    self.game_over()
-                    break
+            changed = True
+
+        # Vérifier les collisions entre le joueur et les ennemis : seuls ceux qui occupent
+        # la case du joueur peuvent le toucher
+        px, py = int(self.data.player.x), int(self.data.player.y)
+        for enemy in self.data.occupancy.at(px, py):
+            if enemy is not self.data.key and enemy.state == 0:  # Ne tester que les ennemis actifs
+                self.game_over()
+                changed = True
+                break
+
+        # Ennemis rangés en tableaux : une seule recherche sur la case du joueur
+        if pool is not None and pool.hit(px, py):
+            self.game_over()
+            changed = True
+
+        # Statistiques de performance (réafficher quand elles changent si elles sont visibles)
+        if self.perf.record_tick(time.perf_counter() - start, updated) and self.data.show_perf:
+            changed = True
+
+        # Ne réveiller le thread d'affichage que si quelque chose a changé
+        if changed:
+            self.data.mark_dirty()
 
     def show(self):
         """
         Fonction d'affichage du jeu
+        Retourne le nombre d'octets envoyés, ou None si l'image a été abandonnée
+        parce que la sortie est saturée
         """
-        # Effacer l'écran
-        sys.stdout.write("\033[H")
+        # Ne pas empiler les images sur une sortie qui n'arrive pas à suivre
+        if not self.target.ready():
+            return None
 
-        # Afficher le niveau
+        # Le terminal a changé de taille : refaire la mise en page
+        if self.data.resized:
+            self.data.resized = False
+            self.layout()
+
+        renderer = self.renderer
         current_level = self.data.levels[self.data.level - 1]
-        current_level.show()
+
+        # La caméra suit le joueur, seule la fenêtre visible du niveau est dessinée
+        camera = self.camera
+        camera.follow(int(self.data.player.x), int(self.data.player.y), current_level.width, current_level.height)
+        renderer.set_view(camera.x, camera.y, camera.width, camera.height)
+
+        # Repartir d'une image vide
+        renderer.clear()
+
+        # Afficher le niveau
+        current_level.show(renderer)
 
         # Afficher la clé si elle n'a pas été ramassée
         if not self.data.has_key:
-            self.data.key.show()
+            self.data.key.show(renderer)
 
         # Afficher les ennemis
         for enemy in self.data.enemies:
-            enemy.show()
+            enemy.show(renderer)
+        if self.data.enemy_pool is not None:
+            self.data.enemy_pool.show(renderer)
 
         # Afficher le joueur (en dernier pour qu'il soit au-dessus)
-        self.data.player.show()
+        self.data.player.show(renderer)
 
         # Afficher les informations du jeu
-        sys.stdout.write(f"\033[{self.data.y_max}H\033[K")
-        sys.stdout.write(
-            f"\033[{self.data.y_max}H\033[KVies: {self.data.lives} | Niveau: {self.data.level} | Score: {int(self.data.score)} | ")
-        sys.stdout.write(
-            f"Clé: {'Oui' if self.data.has_key else 'Non'} | [q/d]: Déplacer | [z]: Gravité | [e]: Prendre clé | [r]: Restart | [Echap]: Quitter")
+        renderer.text(0, renderer.height - 1,
+                      f"Vies: {self.data.lives} | Niveau: {self.data.level} | Score: {int(self.data.score)} | "
+                      f"Clé: {'Oui' if self.data.has_key else 'Non'} | [q/d]: Déplacer | [z]: Gravité | [e]: Prendre clé | [r]: Restart | [p]: Perf | [Echap]: Quitter")
 
-        sys.stdout.flush()
+        # Statistiques de performance juste au-dessus de la ligne d'informations
+        if self.data.show_perf:
+            renderer.text(0, renderer.height - 2, self.perf.summary(), "\033[36m")
+
+        # N'envoyer au terminal que les cellules modifiées
+        return renderer.present()
 
     def game_over(self):
         """
@@ -336,34 +475,15 @@ class Game:
         self.data.score -= 1000
 
         if self.data.lives <= 0:
-            self.data.running = False
+            self.data.stop()
             self.data.victory = False  # Défaite
 
-            # Nettoyer l'écran
-            sys.stdout.write("\033[H\033[2J")
-            sys.stdout.flush()
-
-            # Déterminer le chemin du fichier fin.txt
-            file_paths = ["./fin.txt", "fin.txt", os.path.join(os.path.dirname(__file__), "fin.txt")]
-            end_text = None
-
-            for path in file_paths:
-                try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        end_text = f.read()
-                        break
-                except (FileNotFoundError, IOError):
-                    continue
-
-            # Afficher le texte de fin
-            if end_text:
-                lines = end_text.split('\n')
-                for i, line in enumerate(lines):
-                    sys.stdout.write("\033[1;31m" + f"\033[{i + 2};1H{line}" + "\033[0;0m")
-            else:
-                sys.stdout.write("\033[10;30H\033[31mGAME OVER\033[0m")
+            # Sans terminal, pas d'écran de fin ni de saisie du score
+            if not self.target.is_tty:
+                return
 
-            sys.stdout.flush()
+            # Afficher l'écran de fin, préparé au démarrage
+            self.target.write(self.screens.game_over)
 
             # Petite pause pour laisser voir le message
             time.sleep(1)
@@ -387,35 +507,16 @@ class Game:
         """
         Termine la partie si le joueur gagne
         """
-        self.data.running = False
+        self.data.stop()
         self.data.victory = True  # Victoire
         self.data.score += int(5000 * (self.data.lives / 5) + 50)  # Bonus de victoire
 
-        # Nettoyer l'écran
-        sys.stdout.write("\033[H\033[2J")
-        sys.stdout.flush()
+        # Sans terminal, pas d'écran de fin ni de saisie du score
+        if not self.target.is_tty:
+            return
 
-        # Déterminer le chemin du fichier Victoire.txt
-        file_paths = ["./Victoire.txt", "Victoire.txt", os.path.join(os.path.dirname(__file__), "Victoire.txt")]
-        victory_text = None
-
-        for path in file_paths:
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    victory_text = f.read()
-                    break
-            except (FileNotFoundError, IOError):
-                continue
-
-        # Afficher le texte de victoire
-        if victory_text:
-            lines = victory_text.split('\n')
-            for i, line in enumerate(lines):
-                sys.stdout.write("\033[1;32m" + f"\033[{i + 2};1H{line}" + "\033[0;0m")
-        else:
-            sys.stdout.write("\033[1;32m" + "\033[10;30H\033[32mVICTOIRE!\033[0m" + "\033[0;0m")
-
-        sys.stdout.flush()
+        # Afficher l'écran de victoire, préparé au démarrage
+        self.target.write(self.screens.victory)
 
         # Petite pause pour laisser voir le message
         time.sleep(1)
@@ -436,6 +537,10 @@ class Game:
         """
         Quitte l'application
         """
+        if not self.target.is_tty:
+            self.data.stop()
+            return
+
         # Restaurer les paramètres du terminal
         termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self.data.old_settings)
 
@@ -444,90 +549,126 @@ class Game:
         sys.stdout.write("\033[H\033[2J")
         sys.stdout.flush()
 
-        self.data.running = False
+        self.data.stop()
         sys.exit(0)
 
     def display_thread(self):
         """
         Thread dédié à l'affichage
-        """
-        last_time = time.time()
-
-        while self.data.running:
-            current_time = time.time()
-            elapsed = current_time - last_time
-            last_time = current_time
+        Dort tant que rien n'a changé, puis réaffiche au plus une fois par période d'affichage
+        La période est ajustée par le régulateur selon le coût mesuré des images
+        """
+        data = self.data
+        governor = self.governor
+        last_show = 0
+
+        while data.running:
+            with data.display_cond:
+                # Attendre qu'un changement soit signalé
+                if not data.dirty:
+                    data.display_cond.wait()
+                    continue
 
-            # Mettre à jour l'affichage périodiquement
-            self.data.show_time += elapsed
-            if self.data.show_time >= self.data.show_period:
-                with self.data.display_lock:
-                    self.show()
-                self.data.show_time = 0
+                # Respecter la période d'affichage, sauf pour répondre à une touche
+                delay = last_show + governor.period - time.monotonic()
+                if delay > 0 and not data.urgent:
+                    data.display_cond.wait(delay)
+                    continue
 
-            # Pause pour éviter de surcharger le CPU
-            time.sleep(0.01)
+                data.dirty = False
+                data.urgent = False
+
+            # Construire et écrire l'image hors du verrou : la simulation signale ses changements
+            # (mark_dirty) sans jamais attendre une écriture lente sur le terminal
+            start = time.monotonic()
+            nbytes = self.show()
+            if nbytes is not None:
+                # Mesurer la construction et l'écriture de l'image
+                cost = time.monotonic() - start
+                governor.record(cost)
+                self.perf.record_frame(cost, nbytes)
+            else:
+                # Image abandonnée : réessayer plus tard avec l'état le plus récent
+                with data.display_cond:
+                    data.dirty = True
+                governor.dropped()
+            last_show = time.monotonic()
 
-    def run(self):
+    def run(self, realtime=True, max_ticks=None):
         """
-        Boucle de simulation avec threading
+        Boucle de simulation à pas de temps fixe avec threading
+        Chaque appel à live() fait avancer le jeu de exactement timeStep secondes,
+        quel que soit le temps réellement mis par la machine
+        realtime: suivre l'horloge ; sinon enchaîner les pas aussi vite que possible (jeu sans terminal)
+        max_ticks: arrêter la partie après ce nombre de pas (None : jusqu'à la fin de la partie)
+        Renvoie le nombre de pas simulés
         """
         # Créer et démarrer le thread d'affichage
         display = threading.Thread(target=self.display_thread)
         display.daemon = True
         display.start()
 
+        step = self.data.timeStep
+        max_lag = step * self.data.max_steps
+        accumulator = 0.0  # Temps écoulé pas encore simulé
+        previous = time.monotonic()
+        ticks = 0
+
         # Boucle principale du jeu
         while self.data.running:
             # Gérer les entrées utilisateur
             self.interact()
 
-            # Mettre à jour la simulation
-            self.live()
+            if realtime:
+                now = time.monotonic()
+                accumulator += now - previous
+                previous = now
+
+                # Machine trop lente : abandonner le retard plutôt que de l'accumuler sans fin
+                if accumulator > max_lag:
+                    accumulator = max_lag
+            else:
+                accumulator = step
+
+            # Rattraper le temps écoulé, un pas fixe à la fois
+            while accumulator >= step and self.data.running:
+                self.live()
+                accumulator -= step
+                ticks += 1
+                if max_ticks is not None and ticks >= max_ticks:
+                    self.data.stop()
 
-            # Pause pour éviter de surcharger le CPU
-            time.sleep(0.01)
+            # Dormir jusqu'au prochain pas pour ne pas surcharger le CPU
+            if realtime and self.data.running:
+                time.sleep(step - accumulator)
+
+        return ticks
 
     def show_main_menu(self):
         """
         Affiche le menu principal avec les options
         """
-        sys.stdout.write("\033[H\033[2J")
+        # Titre et instructions, préparés au démarrage
+        self.target.write(self.screens.menu)
 
-        # Déterminer le chemin du fichier ZZZZZZ.txt
-        file_paths = ["./ZZZZZZ.txt", "ZZZZZZ.txt", os.path.join(os.path.dirname(__file__), "ZZZZZZ.txt")]
-        intro_text = None
-
-        for path in file_paths:
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    intro_text = f.read()
-                    break
-            except (FileNotFoundError, IOError):
-                continue
-
-        # Afficher le texte d'intro
-        if intro_text:
-            lines = intro_text.split('\n')
-            for i, line in enumerate(lines):
-                sys.stdout.write("\033[1;36m" + f"\033[{i + 2};1H{line}" + "\033[0;0m")
-        else:
-            sys.stdout.write("\033[10;30HZZZZZZ")
-
-        # Afficher les instructions
-        sys.stdout.write("\033[19;25H\033[1;33m╔════════════════════════════════════════╗\033[0m")
-        sys.stdout.write("\033[20;25H\033[1;33m║               INSTRUCTIONS             ║\033[0m")
-        sys.stdout.write("\033[21;25H\033[1;33m╚════════════════════════════════════════╝\033[0m")
-        sys.stdout.write("\033[23;25H[S]: Sortie | [?/¿]: Joueur | [K]: clé")
-        sys.stdout.write("\033[24;25H[E]: Ennemi rouge (actif en gravité normale)")
-        sys.stdout.write("\033[25;25H[F]: Ennemi jaune (actif en gravité inversée)")
-        sys.stdout.write("\033[27;25H\033[1;32m[Entrée]: Jouer | [h]: Scores | [Echap]: Quitter\033[0m")
-        sys.stdout.flush()
+    def headless(self, max_ticks=None):
+        """
+        Joue une partie sans terminal : aucune touche lue, pas enchaînés sans suivre l'horloge
+        max_ticks: arrêter la partie après ce nombre de pas (None : jusqu'à la fin de la partie)
+        """
+        self.init()
+        ticks = self.run(realtime=False, max_ticks=max_ticks)
+        print(f"{ticks} pas | Vies: {self.data.lives} | Niveau: {self.data.level} | Score: {int(self.data.score)}")
 
     def main(self):
         """
         Fonction principale du jeu
         """
+        # Pas de terminal pour lire les touches : jouer directement, sans menu
+        if not self.target.is_tty:
+            self.headless(HEADLESS_TICKS)
+            return
+
         # Configuration du terminal pour la détection des touches
         old_settings = termios.tcgetattr(sys.stdin)
         tty.setraw(sys.stdin.fileno())
@@ -569,6 +710,32 @@ class Game:
             sys.exit(0)
 
 
+def parse_args(args):
+    """
+    Lit les options de la ligne de commande
+    --headless : jouer sans terminal, l'affichage est jeté
+    --ticks N : nombre de pas de la partie sans terminal (implique --headless)
+    Renvoie (sans terminal, nombre de pas)
+    """
+    headless = False
+    ticks = HEADLESS_TICKS
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg == "--headless":
+            headless = True
+        elif arg == "--ticks" and args and args[0].isdigit():
+            headless = True
+            ticks = int(args.pop(0))
+        else:
+            sys.exit(f"Option inconnue : {arg} (usage : main.py [--headless] [--ticks N])")
+    return headless, ticks
+
+
 if __name__ == "__main__":
-    game = Game()
-    game.main()
+    headless, ticks = parse_args(sys.argv[1:])
+    if headless or not TerminalTarget().is_tty:
+        Game(NullTarget()).headless(ticks)
+    else:
+        game = Game()
+        game.main()
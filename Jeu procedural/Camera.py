@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+class Camera: pass
+
+
+def create(width, height, margin=4):
+    """
+    Crée une caméra : la fenêtre du niveau visible à l'écran
+    margin: distance minimale (en cases) entre le joueur et le bord de la fenêtre
+    """
+    camera = {
+        'x': 0,
+        'y': 0,
+        'width': width,
+        'height': height,
+        'margin': margin
+    }
+    return camera
+
+
+def resize(c, width, height):
+    """
+    Change la taille de la fenêtre (après un redimensionnement du terminal)
+    """
+    c['width'] = width
+    c['height'] = height
+
+
+def follow(c, x, y, level_width, level_height):
+    """
+    Déplace la fenêtre pour garder la position (x, y) visible, sans sortir du niveau
+    """
+    c['x'] = follow_axis(c, c['x'], x, c['width'], level_width)
+    c['y'] = follow_axis(c, c['y'], y, c['height'], level_height)
+
+
+def follow_axis(c, start, position, size, level_size):
+    """
+    Calcule le début de la fenêtre sur un axe
+    """
+    # La marge ne peut pas dépasser la moitié de la fenêtre
+    margin = max(0, min(c['margin'], (size - 1) // 2))
+
+    if position < start + margin:
+        start = position - margin
+    elif position > start + size - 1 - margin:
+        start = position - (size - 1 - margin)
+
+    # Un niveau plus petit que la fenêtre reste collé en haut à gauche
+    return max(0, min(start, level_size - size))
@@ -1,15 +1,26 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import sys
+import Level
+import Renderer
+import SpatialIndex
+import Tile
 
 
 class Enemy: pass
 
 
-def create(x, y, enemy_type=1):
+# Apparence des ennemis selon leur type, partagée par tous les ennemis
+CHARS = {1: 'E', 2: 'F'}  # E pour standard, F pour gravité inverse
+COLORS = {1: "\033[31m", 2: "\033[33m"}  # Rouge ou jaune
+INACTIVE_COLOR = "\033[37m"  # Gris clair
+
+
+def create(x, y, enemy_type=1, level=None, bounds=None):
     """
     Crée un ennemi
+    level: niveau où l'ennemi apparaît, pour calculer sa patrouille (sans niveau, il reste sur place)
+    bounds: bornes (min_x, max_x) de la patrouille si elles sont déjà connues (table d'apparition du niveau)
 
     Types:
     1: ennemi rouge (standard) - actif en gravité normale
@@ -18,16 +29,52 @@ def create(x, y, enemy_type=1):
     enemy = {
         'x': x,
         'y': y,
-        'color': "\033[31m" if enemy_type == 1 else "\033[33m",  # Rouge ou Jaune
         'type': enemy_type,  # 1: standard, 2: gravité inverse
         'state': 0,  # 0: état normal, 1: inactif
         'direction': 1,  # 1: droite, -1: gauche
         'speed': 0.1,
         'movement_counter': 0
     }
+
+    # Bornes de la patrouille : le niveau ne change pas, elles sont calculées une seule fois
+    if bounds is not None:
+        enemy['min_x'], enemy['max_x'] = bounds
+    else:
+        enemy['min_x'], enemy['max_x'] = patrol_bounds(enemy, level) if level is not None else (x, x)
     return enemy
 
 
+def walkable(e, level, x, y):
+    """
+    Indique si l'ennemi peut se placer sur la case (x, y) : elle ne doit pas le bloquer
+    et doit avoir un sol (type 1) ou un plafond (type 2), le bord du niveau n'en servant pas
+    """
+    if e['type'] == 1:
+        walls, support = Tile.SOLID | Tile.TELEPORTER, y + 1
+    else:
+        walls, support = Tile.SOLID | Tile.TELEPORTER | Tile.SPAWN, y - 1
+
+    # Une case hors du niveau bloque comme un mur
+    if Level.flag(level, x, y) & walls:
+        return False
+
+    beside = Level.flag(level, x, support)
+    return not beside & Tile.OUTSIDE and bool(beside & Tile.BLOCKING)
+
+
+def patrol_bounds(e, level):
+    """
+    Calcule les colonnes extrêmes de la patrouille de part et d'autre de la position de départ
+    """
+    y = int(e['y'])
+    min_x = max_x = int(e['x'])
+    while walkable(e, level, min_x - 1, y):
+        min_x -= 1
+    while walkable(e, level, max_x + 1, y):
+        max_x += 1
+    return min_x, max_x
+
+
 def get_pos(e):
     """
     Récupère les coordonnées de l'ennemi
@@ -44,70 +91,55 @@ def set_pos(e, x, y):
     return e
 
 
-def move(e, data):
+def is_active_for(e, gravity):
     """
-    Déplace l'ennemi
+    Indique si l'ennemi est actif pour la gravité du joueur donnée
     """
+    return (e['type'] == 1) == (gravity > 0)
 
-    level = data['levels'][data['level'] - 1]
 
-    # Vérifier si l'ennemi est actif selon son type et la gravité du joueur
-    is_active = True
-    if (e['type'] == 1 and data['player']['gravity'] < 0) or (e['type'] == 2 and data['player']['gravity'] > 0):
-        is_active = False
-        e['state'] = 1  # Inactif
+def sort(data, gravity):
+    """
+    Répartit les ennemis entre actifs et suspendus selon la gravité du joueur
+    Ne fait rien tant que la gravité ne change pas ; quand elle s'inverse, les ennemis
+    suspendus deviennent exactement les actifs et inversement : il suffit d'échanger les listes
+    Retourne True si l'apparence des ennemis a changé
+    """
+    if gravity == data['enemies_gravity']:
+        return False
+
+    if data['enemies_gravity'] is None:
+        data['active_enemies'] = [e for e in data['enemies'] if is_active_for(e, gravity)]
+        data['dormant_enemies'] = [e for e in data['enemies'] if not is_active_for(e, gravity)]
     else:
+        data['active_enemies'], data['dormant_enemies'] = data['dormant_enemies'], data['active_enemies']
+    data['enemies_gravity'] = gravity
+
+    for e in data['active_enemies']:
         e['state'] = 0  # Actif
+    for e in data['dormant_enemies']:
+        e['state'] = 1  # Inactif (affiché en gris)
+    return True
+
+
+def move(e, data):
+    """
+    Déplace l'ennemi
+    Seuls les ennemis actifs sont déplacés : le moteur ne l'appelle pas pour les ennemis suspendus
+    """
+
+    # Mouvement de patrouille simple
+    e['movement_counter'] += e['speed']
 
-    # Ne déplacer que les ennemis actifs
-    if is_active:
-        # Mouvement de patrouille simple
-        e['movement_counter'] += e['speed']
-
-        if e['movement_counter'] >= 1:
-            e['movement_counter'] -= 1
-            if e['type'] == 1:
-                # Calculer la nouvelle position potentielle
-                new_x = int(e['x'] + e['direction'])
-                y_int = int(e['y'])
-
-                # Vérifier s'il y a une collision ou un vide en dessous
-                if (new_x < 0 or new_x >= level['width'] or y_int >= level['height'] or
-                        (y_int < level['height'] and y_int >= 0 and new_x < len(level['grille'][y_int]) and
-                         (level['grille'][y_int][new_x] == '#' or level['grille'][y_int][new_x] == '+'))):
-                    # Changer de direction
-                    e['direction'] *= -1
-                else:
-                    # Vérifier s'il y a un sol sous l'ennemi
-                    if (y_int + 1 >= level['height'] or
-                            (y_int + 1 < level['height'] and new_x < len(level['grille'][y_int + 1]) and
-                             level['grille'][y_int + 1][new_x] != '#' and
-                             level['grille'][y_int + 1][new_x] != '=')):
-                        # Pas de sol, changer de direction
-                        e['direction'] *= -1
-                    else:
-                        # Déplacer l'ennemi
-                        e['x'] = new_x
-            elif e['type'] == 2:
-                new_x = int(e['x'] + e['direction'])
-                y_int = int(e['y'])
-
-                if (new_x < 0 or new_x >= level['width'] or y_int >= level['height'] or
-                        (y_int < level['height'] and y_int >= 0 and new_x < len(level['grille'][y_int]) and
-                         (level['grille'][y_int][new_x] == '#' or level['grille'][y_int][new_x] == '+' or level['grille'][y_int][new_x] == 'E'))):
-                    # Changer de direction
-                    e['direction'] *= -1
-                else:
-                    # Vérifier s'il y a un plafond sur l'ennemi
-                    if (y_int - 1 >= level['height'] or
-                            (y_int - 1 < level['height'] and new_x < len(level['grille'][y_int - 1]) and
-                             level['grille'][y_int - 1][new_x] != '#' and
-                             level['grille'][y_int - 1][new_x] != '=')):
-                        # Pas de plafond, changer de direction
-                        e['direction'] *= -1
-                    else:
-                        # Déplacer l'ennemi
-                        e['x'] = new_x
+    if e['movement_counter'] >= 1:
+        e['movement_counter'] -= 1
+        # Rebondir sur les bornes de la patrouille, calculées à l'apparition
+        new_x = e['x'] + e['direction']
+        if e['min_x'] <= new_x <= e['max_x']:
+            SpatialIndex.move(data['occupancy'], e, e['x'], e['y'], new_x, e['y'])
+            e['x'] = new_x
+        else:
+            e['direction'] *= -1
 
 
 def test_player(e, player):
@@ -135,11 +167,14 @@ def set_speed(e, v):
 def live(e, data):
     """
     Met à jour l'état de l'ennemi
+    Retourne True si son apparence à l'écran a changé
     """
+    old_x = e['x']
     move(e, data)
+    return e['x'] != old_x
 
 
-def show(e):
+def show(e, r):
     """
     Affiche l'ennemi
     """
@@ -148,10 +183,10 @@ def show(e):
     y = int(e['y'])
 
     # Caractère selon le type d'ennemi
-    char = 'E' if e['type'] == 1 else 'F'  # E pour standard, F pour gravité inverse
+    char = CHARS[e['type']]
 
     # Ne pas afficher les ennemis inactifs (ou les afficher différemment)
     if e['state'] == 0:  # Actif
-        sys.stdout.write(f"\033[{y + 1};{x + 1}H{e['color']}{char}\033[0m")
+        Renderer.put(r, x, y, char, COLORS[e['type']])
     else:  # Inactif - afficher en semi-transparent (gris clair)
-        sys.stdout.write(f"\033[{y + 1};{x + 1}H\033[37m{char}\033[0m")
+        Renderer.put(r, x, y, char, INACTIVE_COLOR)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from array import array
+import Enemy
+import Renderer
+
+
+class EnemyPool: pass
+
+
+def create(level, enemies=()):
+    """
+    Crée un groupe d'ennemis rangé en tableaux, un tableau par attribut, plutôt qu'en dictionnaires
+    Les ennemis qui avancent au même rythme (même type, même vitesse, même compteur de
+    mouvement) forment une cohorte : son compteur n'avance qu'une fois par pas de simulation,
+    et ses membres ne sont parcourus qu'aux pas où ils bougent, pour les niveaux qui comptent
+    des centaines ou des milliers d'ennemis
+    level: niveau où se trouvent les ennemis
+    enemies: ennemis (voir Enemy.create) à ranger dans le groupe
+    """
+    pool = {
+        'x': array('l'),
+        'y': array('l'),
+        'type': array('b'),  # 1: standard, 2: gravité inverse
+        'state': array('b'),  # 0: actif, 1: inactif
+        'direction': array('b'),
+        'min_x': array('l'),  # Bornes de la patrouille
+        'max_x': array('l'),
+        # Cohortes : vitesse et compteur de mouvement communs, numéros des ennemis membres
+        'cohort_speed': array('d'),
+        'cohort_counter': array('d'),
+        'cohort_members': [],
+        'cohorts': {enemy_type: [] for enemy_type in (1, 2)},  # Numéros des cohortes par type
+        # Occupation des cases : nombre d'ennemis de chaque type par case du niveau,
+        # tenu à jour à chaque déplacement
+        'width': level['width'],
+        'height': level['height'],
+        'occupancy': {enemy_type: array('H', [0]) * (level['width'] * level['height']) for enemy_type in (1, 2)},
+        'active': (1, 2),  # Types des ennemis actifs (tous tant que la gravité n'est pas connue)
+        'members': {enemy_type: array('l') for enemy_type in (1, 2)}  # Numéros des ennemis par type
+    }
+
+    for enemy in enemies:
+        add(pool, enemy)
+
+    return pool
+
+
+def collect(data, level):
+    """
+    Range les ennemis du niveau qui vient d'être créé dans un groupe en tableaux,
+    si la partie le demande
+    """
+    data['enemy_pool'] = None
+    if data['pooled_enemies']:
+        data['enemy_pool'] = create(level, data['enemies'])
+        data['enemies'].clear()
+
+
+def size(pool):
+    """
+    Nombre d'ennemis dans le groupe
+    """
+    return len(pool['x'])
+
+
+def cohort(pool, enemy_type, speed, counter):
+    """
+    Numéro de la cohorte des ennemis de ce type qui avancent à cette vitesse avec ce compteur,
+    créée si elle n'existe pas encore
+    """
+    for c in pool['cohorts'][enemy_type]:
+        if pool['cohort_speed'][c] == speed and pool['cohort_counter'][c] == counter:
+            return c
+    c = len(pool['cohort_speed'])
+    pool['cohort_speed'].append(speed)
+    pool['cohort_counter'].append(counter)
+    pool['cohort_members'].append(array('l'))
+    pool['cohorts'][enemy_type].append(c)
+    return c
+
+
+def add(pool, e):
+    """
+    Ajoute un ennemi au groupe (ses bornes de patrouille doivent être calculées)
+    """
+    i = len(pool['x'])
+    pool['occupancy'][e['type']][int(e['y']) * pool['width'] + int(e['x'])] += 1
+    pool['members'][e['type']].append(i)
+    pool['cohort_members'][cohort(pool, e['type'], e['speed'], e['movement_counter'])].append(i)
+    pool['x'].append(int(e['x']))
+    pool['y'].append(int(e['y']))
+    pool['type'].append(e['type'])
+    pool['state'].append(e['state'])
+    pool['direction'].append(e['direction'])
+    pool['min_x'].append(e['min_x'])
+    pool['max_x'].append(e['max_x'])
+
+
+def active_count(pool):
+    """
+    Nombre d'ennemis actifs, les seuls mis à jour à chaque pas
+    """
+    return sum(len(pool['members'][enemy_type]) for enemy_type in pool['active'])
+
+
+def update(pool, gravity):
+    """
+    Met à jour les ennemis actifs selon la gravité du joueur (voir Enemy.move)
+    Les ennemis suspendus ne sont parcourus que lorsque la gravité s'inverse
+    Retourne True si l'apparence d'au moins un ennemi à l'écran a changé
+    """
+    # Seuls les ennemis du type correspondant à la gravité sont actifs
+    active_type = 1 if gravity > 0 else 2
+    changed = False
+
+    if pool['active'] != (active_type,):
+        pool['active'] = (active_type,)
+        for i in pool['members'][active_type]:
+            pool['state'][i] = 0  # Actif
+        for i in pool['members'][3 - active_type]:  # L'autre type
+            pool['state'][i] = 1  # Inactif (affiché en gris)
+        changed = size(pool) > 0
+
+    xs, ys, directions, min_xs, max_xs = pool['x'], pool['y'], pool['direction'], pool['min_x'], pool['max_x']
+    speeds, counters, members = pool['cohort_speed'], pool['cohort_counter'], pool['cohort_members']
+    occupancy = pool['occupancy'][active_type]
+    width = pool['width']
+
+    for c in pool['cohorts'][active_type]:
+        # Un seul compteur par cohorte : tous ses membres bougent au même pas
+        counter = counters[c] + speeds[c]
+        if counter >= 1:
+            counter -= 1
+            for i in members[c]:
+                # Mouvement de patrouille : rebond entre les bornes calculées à l'apparition
+                new_x = xs[i] + directions[i]
+                if min_xs[i] <= new_x <= max_xs[i]:
+                    cell = ys[i] * width + xs[i]
+                    occupancy[cell] -= 1
+                    occupancy[cell + directions[i]] += 1
+                    xs[i] = new_x
+                    changed = True
+                else:
+                    directions[i] = -directions[i]
+        counters[c] = counter
+
+    return changed
+
+
+def hit(pool, x, y):
+    """
+    Indique si un ennemi actif occupe la case (x, y) du joueur
+    """
+    if not (0 <= x < pool['width'] and 0 <= y < pool['height']):
+        return False
+    cell = y * pool['width'] + x
+    return any(pool['occupancy'][enemy_type][cell] for enemy_type in pool['active'])
+
+
+def show(pool, r):
+    """
+    Affiche tous les ennemis (les inactifs en gris clair)
+    """
+    for i, x in enumerate(pool['x']):
+        enemy_type = pool['type'][i]
+        color = Enemy.COLORS[enemy_type] if pool['state'][i] == 0 else Enemy.INACTIVE_COLOR
+        Renderer.put(r, x, pool['y'][i], Enemy.CHARS[enemy_type], color)
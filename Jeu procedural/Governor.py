@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+class Governor: pass
+
+
+def create(period, period_min, period_max, budget=0.25, smoothing=0.2):
+    """
+    Crée un régulateur de la cadence d'affichage
+    La période entre deux images s'adapte au coût mesuré de chaque image (construction + écriture)
+    pour que l'affichage n'occupe qu'une fraction du temps, entre period_min et period_max
+    budget: fraction du temps que l'affichage peut occuper
+    smoothing: poids d'une nouvelle mesure dans la moyenne glissante du coût
+    """
+    governor = {
+        'period': period,
+        'period_min': period_min,
+        'period_max': period_max,
+        'budget': budget,
+        'smoothing': smoothing,
+        'cost': 0,  # Coût moyen d'une image (secondes)
+        'frames': 0,  # Images affichées
+        'drops': 0  # Images abandonnées car la sortie était saturée
+    }
+    return governor
+
+
+def clamp(g, period):
+    """
+    Garde une période entre les bornes configurées
+    """
+    return max(g['period_min'], min(period, g['period_max']))
+
+
+def record(g, cost):
+    """
+    Prend en compte le coût d'une image affichée et ajuste la période
+    """
+    if g['frames'] == 0:
+        g['cost'] = cost
+    else:
+        g['cost'] += g['smoothing'] * (cost - g['cost'])
+    g['frames'] += 1
+    g['period'] = clamp(g, g['cost'] / g['budget'])
+
+
+def dropped(g):
+    """
+    Une image a été abandonnée (sortie saturée, par exemple une liaison SSH lente) :
+    ralentir la cadence au lieu d'accumuler des images en attente
+    """
+    g['drops'] += 1
+    g['period'] = clamp(g, g['period'] * 2)
@@ -1,18 +1,19 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import sys
+import Renderer
 
 class Key: pass
 
+COLOR = "\033[33m"  # Couleur jaune, commune à toutes les clés
+
 def create(x, y):
     """
     Crée une clé
     """
     key = {
         'x': x,
-        'y': y,
-        'color': "\033[33m",  # Couleur jaune
+        'y': y
     }
     return key
 
@@ -30,11 +31,11 @@ def set_pos(k, x, y):
     k['y'] = y
     return k
 
-def show(k):
+def show(k, r):
     """
     Affiche la clé
     """
     # Convertir en entiers pour l'affichage
     x = int(k['x'])
     y = int(k['y'])
-    sys.stdout.write(f"\033[{y+1};{x+1}H{k['color']}K\033[0m")
\ No newline at end of file
+    Renderer.put(r, x, y, 'K', COLOR)
\ No newline at end of file
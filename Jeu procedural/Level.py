@@ -1,19 +1,55 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import sys
+import io
+from array import array
+import EnemyPool
+import LevelCompiler
+import Renderer
+import SpatialIndex
+import Tile
 
 
 class Level: pass
 
 
-def create(filename, offset):
+# Apparence des cases fixes du niveau : caractère -> (caractère affiché, couleur)
+# Les ennemis, le joueur et la clé sont dessinés par leur propre show(),
+# toutes les autres cases restent vides
+TILES = {
+    '#': (' ', "\033[47m"),  # Bloc blanc
+    'S': ('S', "\033[36m"),  # Sortie en cyan
+    '=': ('=', "\033[37m"),  # Plateforme en gris
+    '+': ('▓', "\033[45m"),  # Téléporteur en magenta
+}
+
+
+def create(filename, offset, source=None):
     """
     Charge un niveau depuis un fichier
+    Si une version compilée à jour existe (voir LevelCompiler.py), elle est projetée
+    en mémoire à la place du texte
+    source: contenu du niveau déjà lu (texte ou compilé), par exemple depuis un paquet
+    de niveaux (voir LevelPack.py) : le fichier n'est alors pas ouvert
     """
+    if source is None:
+        compiled = LevelCompiler.load_compiled(filename)
+    elif LevelCompiler.is_compiled(source):
+        compiled = LevelCompiler.parse(source, filename)
+    else:
+        compiled = None
+
+    if compiled is not None:
+        compiled['offset'] = offset
+        compiled['background'] = build_background(compiled['grille'])
+        return compiled
+
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        if source is None:
+            with open(filename, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        else:
+            lines = io.StringIO(str(source, 'utf-8'), newline=None).readlines()
     except FileNotFoundError:
         # Si le fichier n'existe pas, créer un niveau par défaut
         lines = [
@@ -46,61 +82,155 @@ def create(filename, offset):
         'grille': lines,
         'width': max_length,
         'height': len(lines),
-        'offset': offset
+        'offset': offset,
+        # Fond statique pré-calculé une seule fois au chargement
+        'background': build_background(lines),
+        # Drapeaux de chaque case (voir Tile.py), une case par octet, ligne après ligne
+        'flags': build_flags(lines)
     }
 
+    # Pour chaque case, première ligne bloquante en dessous et au-dessus dans sa colonne
+    level['floor'], level['ceiling'] = build_landing(level)
+
+    # Positions d'apparition du joueur, de la clé et des ennemis (avec leur patrouille)
+    level['spawns'] = build_spawns(level)
+
     return level
 
 
-def check_exit(l, player, data):
+def build_background(lines):
     """
-    Vérifie si le joueur atteint la sortie
+    Construit les lignes de cellules du décor fixe (murs, plateformes, sorties, téléporteurs)
+    """
+    return [[TILES.get(char, Renderer.BLANK) for char in line] for line in lines]
+
+
+def build_flags(lines):
+    """
+    Construit la grille des drapeaux des cases, consultée par les tests de collision
+    """
+    return bytearray(Tile.FLAGS.get(char, 0) for line in lines for char in line)
+
+
+def build_landing(l):
+    """
+    Construit les tables d'atterrissage : pour chaque case, la ligne de la première case
+    bloquante en dessous (floor) et au-dessus (ceiling) dans la même colonne
+    Sans case bloquante, floor vaut la hauteur du niveau et ceiling -1 : le bord du niveau bloque
+    """
+    width, height, flags = l['width'], l['height'], l['flags']
+    floor = array('h', [height]) * (width * height)
+    ceiling = array('h', [-1]) * (width * height)
+
+    for x in range(width):
+        below = height
+        for y in range(height - 1, -1, -1):
+            floor[y * width + x] = below
+            if flags[y * width + x] & Tile.BLOCKING:
+                below = y
+
+        above = -1
+        for y in range(height):
+            ceiling[y * width + x] = above
+            if flags[y * width + x] & Tile.BLOCKING:
+                above = y
+
+    return floor, ceiling
+
+
+def build_spawns(l):
+    """
+    Construit la table d'apparition des entités, lue à chaque (re)démarrage du niveau :
+    player et key: position (x, y) ou None, enemies: (x, y, type, min_x, max_x) pour chaque ennemi,
+    les ennemis standard d'abord, exits et teleporters: positions des sorties et des téléporteurs
+    Les listes suivent l'ordre de lecture de la grille
+    """
+    import Enemy
+
+    spawns = {'player': None, 'key': None, 'enemies': [], 'exits': [], 'teleporters': []}
+    standard = []
+    inverted = []
+    for y, line in enumerate(l['grille']):
+        for x, char in enumerate(line):
+            if char == '@':
+                spawns['player'] = (x, y)
+            elif char == 'K':
+                spawns['key'] = (x, y)
+            elif char == 'E':
+                standard.append((x, y, 1))
+            elif char == 'F':
+                inverted.append((x, y, 2))
+            elif char == 'S':
+                spawns['exits'].append((x, y))
+            elif char == '+':
+                spawns['teleporters'].append((x, y))
+
+    # Bornes de patrouille calculées par l'ennemi lui-même à son apparition
+    enemies = [Enemy.create(x, y, enemy_type, l) for x, y, enemy_type in standard + inverted]
+    spawns['enemies'] = [(e['x'], e['y'], e['type'], e['min_x'], e['max_x']) for e in enemies]
+    return spawns
+
+
+def player_spawn(l):
     """
-    x, y = int(player['x']), int(player['y'])
+    Position de départ du joueur
+    """
+    return l['spawns']['player'] or (5, 5)  # Position par défaut
+
 
-    # S'assurer que les coordonnées sont valides
-    if y < 0 or y >= len(l['grille']) or x < 0 or x >= len(l['grille'][y]):
-        return False
+def landing(l, x, y, gravity):
+    """
+    Récupère la ligne de la première case bloquante rencontrée en partant de la case (x, y)
+    dans le sens de la gravité : un joueur qui tombe depuis (x, y) s'arrête sur la ligne
+    landing - gravity
+    """
+    if 0 <= x < l['width'] and 0 <= y < l['height']:
+        i = y * l['width'] + x
+        return l['floor'][i] if gravity > 0 else l['ceiling'][i]
+    # Hors du niveau, la case voisine bloque comme un mur
+    return y + gravity
 
+
+def flag(l, x, y):
+    """
+    Récupère les drapeaux de la case (x, y), coordonnées entières
+    Une case hors du niveau se comporte comme un mur
+    """
+    if 0 <= x < l['width'] and 0 <= y < l['height']:
+        return l['flags'][y * l['width'] + x]
+    return Tile.OUT_OF_BOUNDS
+
+
+def check_exit(l, player, data):
+    """
+    Vérifie si le joueur atteint la sortie
+    """
     # Vérifier si la position contient la sortie (et si le joueur a la clé)
-    return l['grille'][y][x] == 'S' and data['has_key']
+    return bool(flag(l, int(player['x']), int(player['y'])) & Tile.EXIT) and data['has_key']
 
 
 def check_secret_exit(l, player, data):
     """
     Vérifie si le joueur atteint la sortie secrete
     """
-    x, y = int(player['x']), int(player['y'])
-
-    # S'assurer que les coordonnées sont valides
-    if y < 0 or y >= len(l['grille']) or x < 0 or x >= len(l['grille'][y]):
-        return False
-
     # Vérifier si la position contient la sortie secrête
-    return l['grille'][y][x] == '+'
+    return bool(flag(l, int(player['x']), int(player['y'])) & Tile.TELEPORTER)
 
 
 def check_teleporter(l, player):
     """
     Vérifie si le joueur atteint un téléporteur
     """
-    x, y = int(player['x']), int(player['y'])
-
-    # S'assurer que les coordonnées sont valides
-    if y < 0 or y >= len(l['grille']) or x < 0 or x >= len(l['grille'][y]):
-        return False
-
     # Vérifier si la position contient un téléporteur
-    return l['grille'][y][x] == '+'
+    return bool(flag(l, int(player['x']), int(player['y'])) & Tile.TELEPORTER)
 
 
 def change_to_secret(data, current_level):
     """
     Change vers un niveau secret
     """
-    import Player
-    import Key
-    import Enemy
+    import LevelCache
+    import LevelPack
 
     # Sauvegarde le niveau courant pour pouvoir revenir au niveau suivant
     data['prev_level'] = data['level']
@@ -110,75 +240,32 @@ def change_to_secret(data, current_level):
     secret_level_name = f"niveau-secret-{data['level']-1:02d}.txt"
 
     # Si le niveau secret n'existe pas, utiliser le fichier niveau-secret-01.txt
-    try:
-        with open(secret_level_name, 'r', encoding='utf-8') as f:
-            pass
-    except FileNotFoundError:
+    if not LevelPack.exists(data['pack'], secret_level_name):
         secret_level_name = "niveau-secret-01.txt"
 
     # Créer le niveau secret
-    secret_level = create(secret_level_name, 0)
+    secret_level = LevelPack.level(data['pack'], secret_level_name)
 
     # Remplacer temporairement le niveau actuel par le niveau secret
     data['current_is_secret'] = True
     data['secret_level'] = secret_level
 
-    player_pos = None
-    key_pos = None
-    enemy_positions = []
-    inverted_enemy_positions = []
-
-    if data['enemies'] != []:
-        data['enemies'].clear()
-
-    # Chercher les positions initiales dans le niveau secret
-    for y, line in enumerate(secret_level['grille']):
-        for x, char in enumerate(line):
-            if char == '@':
-                player_pos = (x, y)
-            elif char == 'K':
-                key_pos = (x, y)
-            elif char == 'E':
-                enemy_positions.append((x, y))
-            elif char == 'F':
-                inverted_enemy_positions.append((x, y))
-
-    # Créer le joueur à la position extraite du niveau
-    if player_pos:
-        data['player'] = Player.create(player_pos[0], player_pos[1])
-    else:
-        data['player'] = Player.create(5, 5)  # Position par défaut
-
-    # Créer la clé à la position extraite du niveau
-    if key_pos:
-        data['key'] = Key.create(key_pos[0], key_pos[1])
-    else:
-        data['key'] = Key.create(20, 20)  # Position par défaut
-
-    # Créer les ennemis aux positions extraites du niveau
-    if enemy_positions:
-        for pos in enemy_positions:
-            data['enemies'].append(Enemy.create(pos[0], pos[1], 1))
-
-    if inverted_enemy_positions:
-        for pos in inverted_enemy_positions:
-            data['enemies'].append(Enemy.create(pos[0], pos[1], 2))
+    # Créer les entités du niveau secret
+    spawn_entities(data, secret_level)
 
     # Important: remplacer temporairement le niveau actuel dans la liste des niveaux
-    if data['level'] <= len(data['levels']):
+    if data['level'] <= LevelCache.size(data['levels']):
         # Sauvegarder le niveau actuel
-        data['saved_level'] = data['levels'][data['level'] - 1]
+        data['saved_level'] = LevelCache.get(data['levels'], data['level'] - 1)
         # Remplacer par le niveau secret
-        data['levels'][data['level'] - 1] = secret_level
+        LevelCache.replace(data['levels'], data['level'] - 1, secret_level)
 
 
 def change(data, next_level):
     """
     Change de niveau si le joueur atteint la sortie
     """
-    import Enemy
-    import Player
-    import Key
+    import LevelCache
 
     if next_level:
         # Si on est dans un niveau secret, aller au niveau suivant celui qui a amené au secret
@@ -192,72 +279,68 @@ def change(data, next_level):
         data['has_key'] = False
         data['score'] += 500
 
-        current_level = data['levels'][data['level'] - 1]
-        player_pos = None
-        key_pos = None
-        enemy_positions = []
-        inverted_enemy_positions = []  # Pour les ennemis de type 2 (gravité inversée)
-
-        if data['enemies'] != []:
-            data['enemies'].clear()
-
-        for y, line in enumerate(current_level['grille']):
-            for x, char in enumerate(line):
-                if char == '@':
-                    player_pos = (x, y)
-                elif char == 'K':
-                    key_pos = (x, y)
-                elif char == 'E':
-                    enemy_positions.append((x, y))
-                elif char == 'F':  # Nouvel ennemi de type 2 (gravité inversée)
-                    inverted_enemy_positions.append((x, y))
-
-        # Créer le joueur à la position extraite du niveau
-        if player_pos:
-            data['player'] = Player.create(player_pos[0], player_pos[1])
-        else:
-            data['player'] = Player.create(5, 5)  # Position par défaut
+        current_level = LevelCache.get(data['levels'], data['level'] - 1)
+
+        # Créer les entités du nouveau niveau
+        spawn_entities(data, current_level)
 
-        # Créer la clé à la position extraite du niveau
-        if key_pos:
-            data['key'] = Key.create(key_pos[0], key_pos[1])
-        else:
-            data['key'] = Key.create(20, 20)  # Position par défaut
 
-        # Créer les ennemis aux positions extraites du niveau
-        if enemy_positions:
-            for pos in enemy_positions:
-                data['enemies'].append(Enemy.create(pos[0], pos[1], 1))  # Type 1: ennemi standard
+def spawn_entities(data, level):
+    """
+    Crée le joueur, la clé et les ennemis d'un niveau depuis sa table d'apparition,
+    calculée à son chargement, puis prépare les recherches sur ces entités
+    """
+    import Player
+    import Key
+    import Enemy
 
-        # Créer les ennemis de type 2 (gravité inversée)
-        if inverted_enemy_positions:
-            for pos in inverted_enemy_positions:
-                data['enemies'].append(Enemy.create(pos[0], pos[1], 2))  # Type 2: ennemi gravité inversée
+    spawns = level['spawns']
 
+    # Créer le joueur
+    player_x, player_y = player_spawn(level)
+    data['player'] = Player.create(player_x, player_y, data['fixed_point'])
 
-def show(l):
+    # Créer la clé
+    key_x, key_y = spawns['key'] or (20, 20)  # Position par défaut
+    data['key'] = Key.create(key_x, key_y)
+
+    # Créer les ennemis, standard puis de gravité inversée, avec leur patrouille déjà calculée
+    data['enemies'].clear()
+    for x, y, enemy_type, min_x, max_x in spawns['enemies']:
+        data['enemies'].append(Enemy.create(x, y, enemy_type, bounds=(min_x, max_x)))
+
+    # Préparer les recherches sur les entités du nouveau niveau
+    place_entities(data, level)
+
+
+def place_entities(data, level):
     """
-    Affiche le niveau
+    Prépare les structures de recherche sur les entités du niveau qui vient d'être créé :
+    groupe d'ennemis en tableaux si la partie le demande, ennemis actifs et suspendus,
+    index d'occupation des cases, préchargement du niveau suivant
     """
-    for y, line in enumerate(l['grille']):
-        sys.stdout.write(f"\033[{y + 1};1H")
-        for x, char in enumerate(line):
-            if char == '#':
-                sys.stdout.write("\033[47m \033[0m")  # Bloc blanc
-            elif char == 'S':
-                sys.stdout.write("\033[36mS\033[0m")  # Sortie en cyan
-            elif char == '=':
-                sys.stdout.write("\033[37m=\033[0m")  # Plateforme en gris
-            elif char == '+':
-                sys.stdout.write("\033[45m▓\033[0m")  # Téléporteur en magenta
-            elif char == 'E' or char == 'F':
-                # Ne pas afficher les ennemis ici, ils sont gérés par Enemy.show()
-                sys.stdout.write(" ")
-            elif char == '@':
-                # Ne pas afficher le joueur ici, il est géré par Player.show()
-                sys.stdout.write(" ")
-            elif char == 'K':
-                # Ne pas afficher la clé ici, elle est gérée par Key.show()
-                sys.stdout.write(" ")
-            else:
-                sys.stdout.write(" ")  # Espace vide
+    import Enemy
+    import LevelCache
+
+    EnemyPool.collect(data, level)
+
+    # Répartir les ennemis entre actifs et suspendus selon la gravité du joueur
+    data['enemies_gravity'] = None
+    Enemy.sort(data, data['player']['gravity'])
+
+    # Index d'occupation des cases, tenu à jour par les déplacements des ennemis
+    data['occupancy'] = SpatialIndex.create()
+    for enemy in data['enemies']:
+        SpatialIndex.add(data['occupancy'], enemy, enemy['x'], enemy['y'])
+    SpatialIndex.add(data['occupancy'], data['key'], int(data['key']['x']), int(data['key']['y']))
+
+    # Charger le niveau suivant pendant que celui-ci est joué
+    LevelCache.prefetch(data['levels'], data['level'])
+
+
+def show(l, r):
+    """
+    Dessine le niveau dans le tampon du moteur de rendu
+    """
+    # Le décor ne change jamais : on recopie le fond pré-calculé
+    Renderer.blit(r, l['background'])
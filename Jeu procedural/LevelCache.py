@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+from collections import OrderedDict
+import Level
+import LevelPack
+
+
+class LevelCache: pass
+
+
+def create(filenames, capacity=3, pack=None):
+    """
+    Crée la liste des niveaux du jeu chargés à la demande
+    Un niveau n'est lu qu'au premier accès (get), et seuls les capacity derniers niveaux
+    utilisés restent en mémoire
+    filenames: fichiers des niveaux, dans l'ordre du jeu
+    pack: paquet de niveaux où les lire (voir LevelPack.py), fichiers séparés sans paquet
+    """
+    cache = {
+        'filenames': list(filenames),
+        'pack': pack,
+        'capacity': capacity,
+        'loaded': OrderedDict(),  # Numéro -> niveau, du moins récemment utilisé au plus récent
+        'replaced': {},  # Niveaux remplacés en cours de partie (niveau secret), jamais évincés
+        'pending': {},  # Numéro -> thread de préchargement en cours
+        'lock': threading.Lock(),
+        'current': (None, None)  # Dernier niveau demandé, relu sans verrou à chaque pas
+    }
+    return cache
+
+
+def size(c):
+    """
+    Nombre de niveaux du jeu
+    """
+    return len(c['filenames'])
+
+
+def position(c, index):
+    """
+    Vérifie un numéro de niveau (les numéros négatifs comptent depuis la fin, comme pour une liste)
+    """
+    if index < 0:
+        index += len(c['filenames'])
+    if not 0 <= index < len(c['filenames']):
+        raise IndexError("numéro de niveau hors limites")
+    return index
+
+
+def get(c, index):
+    """
+    Récupère un niveau, en le chargeant s'il n'est pas en mémoire
+    """
+    current_index, current = c['current']
+    if index == current_index:
+        return current
+
+    index = position(c, index)
+    level = c['replaced'].get(index)
+    if level is None:
+        with c['lock']:
+            level = c['loaded'].get(index)
+            if level is not None:
+                c['loaded'].move_to_end(index)
+            thread = c['pending'].get(index)
+
+        if level is None:
+            if thread is not None:
+                # Le niveau est déjà en cours de chargement en arrière-plan : l'attendre
+                thread.join()
+                return get(c, index)
+            level = load(c, index)
+            store(c, index, level)
+
+    c['current'] = (index, level)
+    return level
+
+
+def replace(c, index, level):
+    """
+    Remplace un niveau pour le reste de la partie (niveau secret)
+    """
+    index = position(c, index)
+    c['replaced'][index] = level
+    if c['current'][0] == index:
+        c['current'] = (index, level)
+
+
+def load(c, index):
+    """
+    Lit un niveau, depuis le paquet s'il y en a un
+    """
+    if c['pack'] is not None:
+        return LevelPack.level(c['pack'], c['filenames'][index])
+    return Level.create(c['filenames'][index], 0)
+
+
+def store(c, index, level):
+    """
+    Range un niveau chargé dans le cache, en évinçant les moins récemment utilisés
+    """
+    with c['lock']:
+        c['loaded'][index] = level
+        c['loaded'].move_to_end(index)
+        while len(c['loaded']) > c['capacity']:
+            c['loaded'].popitem(last=False)
+
+
+def prefetch(c, index):
+    """
+    Charge un niveau dans un thread en arrière-plan, pendant que le niveau courant est joué
+    Ne fait rien si le niveau n'existe pas, est déjà chargé ou en cours de chargement
+    """
+    if not 0 <= index < len(c['filenames']) or index in c['replaced']:
+        return
+    with c['lock']:
+        if index in c['loaded'] or index in c['pending']:
+            return
+        thread = threading.Thread(target=load_in_background, args=(c, index))
+        thread.daemon = True
+        c['pending'][index] = thread
+        # Démarré sous le verrou : un thread attendu par get a toujours démarré
+        thread.start()
+
+
+def load_in_background(c, index):
+    """
+    Corps du thread de préchargement
+    """
+    try:
+        store(c, index, load(c, index))
+    finally:
+        with c['lock']:
+            del c['pending'][index]
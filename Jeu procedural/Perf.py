@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+
+
+class Perf: pass
+
+
+def create(window=1.0):
+    """
+    Crée les statistiques de performance du jeu, publiées à chaque fin de fenêtre de mesure
+    window: durée d'une fenêtre de mesure (secondes)
+    Les mesures de simulation viennent de la boucle principale, celles d'affichage
+    du thread d'affichage : chacune a ses propres compteurs
+    """
+    perf = {
+        'window': window,
+
+        # Simulation (boucle principale)
+        'tick_start': time.monotonic(),
+        'ticks': 0,
+        'tick_total': 0,
+        'tick_max': 0,
+        'enemies_total': 0,
+        'tick_rate': 0,  # Pas de simulation par seconde
+        'tick_avg': 0,  # Durée moyenne d'un pas (secondes)
+        'tick_worst': 0,  # Durée du pas le plus long (secondes)
+        'enemies': 0,  # Ennemis mis à jour par pas
+
+        # Affichage (thread d'affichage)
+        'frame_start': time.monotonic(),
+        'frames': 0,
+        'render_total': 0,
+        'bytes_total': 0,
+        'frame_rate': 0,  # Images par seconde
+        'render_avg': 0,  # Durée moyenne d'une image (secondes)
+        'bytes_per_frame': 0  # Octets envoyés par image
+    }
+    return perf
+
+
+def record_tick(p, duration, enemies_updated):
+    """
+    Enregistre un pas de simulation
+    Retourne True si de nouvelles valeurs viennent d'être publiées
+    """
+    p['ticks'] += 1
+    p['tick_total'] += duration
+    p['tick_max'] = max(p['tick_max'], duration)
+    p['enemies_total'] += enemies_updated
+
+    now = time.monotonic()
+    elapsed = now - p['tick_start']
+    if elapsed < p['window']:
+        return False
+
+    p['tick_rate'] = p['ticks'] / elapsed
+    p['tick_avg'] = p['tick_total'] / p['ticks']
+    p['tick_worst'] = p['tick_max']
+    p['enemies'] = p['enemies_total'] / p['ticks']
+
+    p['tick_start'] = now
+    p['ticks'] = 0
+    p['tick_total'] = 0
+    p['tick_max'] = 0
+    p['enemies_total'] = 0
+    return True
+
+
+def record_frame(p, duration, nbytes):
+    """
+    Enregistre une image affichée
+    """
+    p['frames'] += 1
+    p['render_total'] += duration
+    p['bytes_total'] += nbytes
+
+    now = time.monotonic()
+    elapsed = now - p['frame_start']
+    if elapsed < p['window']:
+        return
+
+    p['frame_rate'] = p['frames'] / elapsed
+    p['render_avg'] = p['render_total'] / p['frames']
+    p['bytes_per_frame'] = p['bytes_total'] / p['frames']
+
+    p['frame_start'] = now
+    p['frames'] = 0
+    p['render_total'] = 0
+    p['bytes_total'] = 0
+
+
+def summary(p):
+    """
+    Résumé d'une ligne pour l'affichage en jeu
+    """
+    return (f"Perf | Simulation: {p['tick_rate']:.0f} pas/s, moy {p['tick_avg'] * 1000:.2f} ms, "
+            f"max {p['tick_worst'] * 1000:.2f} ms | Rendu: {p['frame_rate']:.0f} img/s, "
+            f"{p['render_avg'] * 1000:.2f} ms, {p['bytes_per_frame']:.0f} o/img | Ennemis: {p['enemies']:.0f}")
@@ -1,20 +1,35 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import sys
+import Level
+import LevelCache
+import Renderer
+import SpatialIndex
+import Tile
 
 
 class Player: pass
 
 
-def create(x, y):
+COLOR = "\033[32m"  # Couleur verte, commune à tous les joueurs
+
+# Physique en virgule fixe : une case est découpée en SUBTILE unités entières
+# Les vitesses du jeu (demi-cases) y sont exactes et les calculs reproductibles au bit près
+SUBTILE_SHIFT = 8
+SUBTILE = 1 << SUBTILE_SHIFT
+GRAVITY_STEP = SUBTILE // 2  # Accélération de la gravité à chaque pas : une demi-case
+MAX_FALL_SPEED = 2 * SUBTILE  # Vitesse de chute maximale : deux cases par pas
+
+
+def create(x, y, fixed_point=False):
     """
     Crée un joueur
+    fixed_point: position et vitesse verticales en entiers (SUBTILE unités par case),
+    sinon en nombres à virgule flottante
     """
     player = {
-        'x': x,
-        'y': y,
-        'color': "\033[32m",  # Couleur verte
+        'fixed_point': fixed_point,
+        'sub_y': None,  # Position verticale en unités de virgule fixe (mode virgule fixe)
         'speed': 1,
         'velocity_y': 0,
         'gravity': 1,  # 1 pour gravité vers le bas, -1 pour gravité vers le haut
@@ -22,6 +37,7 @@ def create(x, y):
         'jump_power': -3,
         'jump_cooldown': 0
     }
+    set_pos(player, x, y)
     return player
 
 
@@ -29,8 +45,14 @@ def set_pos(p, x, y):
     """
     Définit la position du joueur
     """
-    p['x'] = x
-    p['y'] = y
+    if p['fixed_point']:
+        # En virgule fixe, x et y restent des cases entières
+        p['x'] = int(x)
+        p['y'] = int(y)
+        p['sub_y'] = p['y'] << SUBTILE_SHIFT
+    else:
+        p['x'] = x
+        p['y'] = y
 
 
 def get_pos(p):
@@ -64,7 +86,10 @@ def gravity_change(p):
     p['gravity'] *= -1
 
     # Ajuster la vitesse pour un petit effet de poussée dans la nouvelle direction
-    p['velocity_y'] = p['jump_power'] * p['gravity'] * 0.5
+    if p['fixed_point']:
+        p['velocity_y'] = p['jump_power'] * p['gravity'] * SUBTILE // 2
+    else:
+        p['velocity_y'] = p['jump_power'] * p['gravity'] * 0.5
     p['on_ground'] = False
     p['jump_cooldown'] = 5  # Éviter les changements multiples trop rapides
 
@@ -75,14 +100,10 @@ def pick_key(data):
     """
 
     p = data['player']
-    k = data['key']
-
-    # Convertir en entiers pour la comparaison
-    px, py = int(p['x']), int(p['y'])
-    kx, ky = int(k['x']), int(k['y'])
 
-    # Si le joueur est à proximité de la clé
-    if abs(px - kx) <= 1 and abs(py - ky) <= 1 and not data['has_key']:
+    # Si le joueur est à proximité de la clé : elle est sur sa case ou une case voisine
+    nearby = SpatialIndex.near(data['occupancy'], int(p['x']), int(p['y']))
+    if any(occupant is data['key'] for occupant in nearby) and not data['has_key']:
         data['has_key'] = True
         data['score'] += 100 * (data['lives']/5)
 
@@ -94,17 +115,66 @@ def set_speed(p, v):
     p['speed'] = v
 
 
+def sweep(x, y, next_y, level):
+    """
+    Calcule la position verticale atteinte en allant de y vers next_y dans la colonne x
+    La première ligne bloquante sur le trajet est lue dans les tables d'atterrissage du niveau :
+    si le trajet l'atteint, le joueur s'arrête à son point de contact (juste au-dessus d'elle
+    en descendant, au bord de la case suivante en montant), sinon il arrive en next_y
+    Toutes les lignes traversées comptent : un grand pas ne peut pas sauter par-dessus un mur
+    """
+    row = int(y)
+    if next_y > y:
+        blocked = Level.landing(level, int(x), row, 1)
+        if int(next_y) < blocked:
+            return next_y
+        contact = blocked - 1 / SUBTILE  # Même point de contact qu'en virgule fixe
+    else:
+        blocked = Level.landing(level, int(x), row, -1)
+        if int(next_y) > blocked:
+            return next_y
+        contact = blocked + 1
+
+    # Départ depuis une case bloquante (entrée par un mouvement horizontal) : ne pas bouger
+    if test_collision(x, y, level):
+        return y
+    return contact
+
+
+def sweep_fixed(p, x, row, next_sub_y, level):
+    """
+    Équivalent de sweep en virgule fixe : position atteinte en allant de la ligne row
+    vers next_sub_y (en unités de virgule fixe) dans la colonne x
+    """
+    next_row = next_sub_y >> SUBTILE_SHIFT
+    if p['velocity_y'] > 0:
+        blocked = Level.landing(level, x, row, 1)
+        if next_row < blocked:
+            return next_sub_y
+        contact = (blocked << SUBTILE_SHIFT) - 1  # Juste au-dessus de la ligne bloquante
+    else:
+        blocked = Level.landing(level, x, row, -1)
+        if next_row > blocked:
+            return next_sub_y
+        contact = (blocked + 1) << SUBTILE_SHIFT
+
+    # Départ depuis une case bloquante (entrée par un mouvement horizontal) : ne pas bouger
+    if Level.flag(level, x, row) & Tile.BLOCKING:
+        return p['sub_y']
+    return contact
+
+
 def collide(p, data):
     """
     Gère les collisions avec le niveau
     """
 
-    level = data['levels'][data['level'] - 1]
-
-    # Vérifier la collision dans la direction de la gravité
-    test_y = p['y'] + p['gravity']
+    level = LevelCache.get(data['levels'], data['level'] - 1)
 
-    if test_collision(p['x'], test_y, level):
+    # Vérifier la collision dans la direction de la gravité :
+    # le joueur est au sol si la case bloquante la plus proche est la case voisine
+    row = int(p['y'])
+    if Level.landing(level, int(p['x']), row, p['gravity']) == row + p['gravity']:
         p['on_ground'] = True
         p['velocity_y'] = 0
     else:
@@ -113,16 +183,9 @@ def collide(p, data):
     # Vérifier les collisions verticales (en fonction de la gravité)
     if p['velocity_y'] != 0:  # Si en mouvement vertical
         next_y = p['y'] + p['velocity_y']
-        if not test_collision(p['x'], next_y, level):
-            p['y'] = next_y
-        else:
-            # Trouver la position valide la plus proche
-            if p['velocity_y'] > 0:
-                while test_collision(p['x'], p['y'] + 0.1, level) == False and abs(p['y'] - next_y) > 0.1:
-                    p['y'] += 0.1
-            else:
-                while test_collision(p['x'], p['y'] - 0.1, level) == False and abs(p['y'] - next_y) > 0.1:
-                    p['y'] -= 0.1
+        p['y'] = sweep(p['x'], p['y'], next_y, level)
+        if p['y'] != next_y:
+            # Arrêté contre une case bloquante sur le trajet
             p['velocity_y'] = 0
 
     # Vérifier les collisions horizontales APRÈS le mouvement à gauche/droite
@@ -139,37 +202,80 @@ def collide(p, data):
     # Mémoriser la position actuelle pour le prochain cycle
     p['_last_x'] = p['x']
 
-    # Vérifier les bords de l'écran
+    # Vérifier les bords du niveau
     if p['x'] < 0:
         p['x'] = 0
-    if p['x'] > data['x_max']:
-        p['x'] = data['x_max']
+    if p['x'] > level['width'] - 1:
+        p['x'] = level['width'] - 1
     if p['y'] < 0:
         p['y'] = 0
-    if p['y'] > data['y_max'] - 1:
-        p['y'] = data['y_max'] - 1
+    if p['y'] > level['height'] - 1:
+        p['y'] = level['height'] - 1
 
 
-def test_collision(x, y, level):
+def collide_fixed(p, data):
     """
-    Teste s'il y a une collision à la position donnée
+    Gère les collisions avec le niveau en virgule fixe : x et y restent des cases entières,
+    seule sub_y porte la partie fractionnaire de la position verticale
     """
-    # Convertir en entiers pour indexation
-    x_int = int(x)
-    y_int = int(y)
+    level = LevelCache.get(data['levels'], data['level'] - 1)
+    x = p['x']
+    row = p['y']
+
+    # Au sol si la case bloquante la plus proche dans le sens de la gravité est la case voisine
+    if Level.landing(level, x, row, p['gravity']) == row + p['gravity']:
+        p['on_ground'] = True
+        p['velocity_y'] = 0
+    else:
+        p['on_ground'] = False
 
-    if x_int < 0 or y_int < 0 or y_int >= len(level['grille']) or x_int >= len(level['grille'][y_int]):
-        return True
+    # Collisions verticales
+    if p['velocity_y'] != 0:
+        next_sub_y = p['sub_y'] + p['velocity_y']
+        p['sub_y'] = sweep_fixed(p, x, row, next_sub_y, level)
+        if p['sub_y'] != next_sub_y:
+            # Arrêté contre une case bloquante sur le trajet
+            p['velocity_y'] = 0
+
+    # Collisions horizontales après le mouvement à gauche/droite
+    last_x = p.get('_last_x', None)
+    if last_x is not None and x != last_x:
+        if Level.flag(level, x, p['sub_y'] >> SUBTILE_SHIFT) & Tile.BLOCKING:
+            p['x'] = last_x
+    p['_last_x'] = p['x']
 
-    cell = level['grille'][y_int][x_int]
+    # Bords du niveau
+    if p['x'] < 0:
+        p['x'] = 0
+    if p['x'] > level['width'] - 1:
+        p['x'] = level['width'] - 1
+    if p['sub_y'] < 0:
+        p['sub_y'] = 0
+    if p['sub_y'] > (level['height'] - 1) << SUBTILE_SHIFT:
+        p['sub_y'] = (level['height'] - 1) << SUBTILE_SHIFT
+
+    p['y'] = p['sub_y'] >> SUBTILE_SHIFT
+
+
+def test_collision(x, y, level):
+    """
+    Teste s'il y a une collision à la position donnée
+    """
+    # Une case hors du niveau bloque comme un mur
     # Note: '+' (téléporteur) ne bloque pas le mouvement, donc on ne le traite pas comme une collision
-    return cell == '#' or cell == '='
+    return bool(Level.flag(level, int(x), int(y)) & Tile.BLOCKING)
 
 
 def live(p, data):
     """
     Met à jour l'état du joueur
+    Retourne True si son apparence à l'écran a changé
     """
+    if p['fixed_point']:
+        return live_fixed(p, data)
+
+    old_look = (int(p['x']), int(p['y']), p['gravity'])
+
     # Appliquer la gravité
     if not p['on_ground']:
         p['velocity_y'] += 0.5 * p['gravity']
@@ -186,8 +292,38 @@ def live(p, data):
     # Gérer les collisions
     collide(p, data)
 
+    return (int(p['x']), int(p['y']), p['gravity']) != old_look
+
+
+def live_fixed(p, data):
+    """
+    Met à jour l'état du joueur en virgule fixe : uniquement des calculs entiers,
+    les mêmes entrées donnent toujours exactement la même trajectoire
+    Retourne True si son apparence à l'écran a changé
+    """
+    old_look = (p['x'], p['y'], p['gravity'])
+
+    # Appliquer la gravité
+    if not p['on_ground']:
+        p['velocity_y'] += GRAVITY_STEP * p['gravity']
+
+    # Limiter la vitesse de chute
+    if p['velocity_y'] > MAX_FALL_SPEED:
+        p['velocity_y'] = MAX_FALL_SPEED
+    elif p['velocity_y'] < -MAX_FALL_SPEED:
+        p['velocity_y'] = -MAX_FALL_SPEED
+
+    # Décrémenter le compteur de saut
+    if p['jump_cooldown'] > 0:
+        p['jump_cooldown'] -= 1
+
+    # Gérer les collisions
+    collide_fixed(p, data)
+
+    return (p['x'], p['y'], p['gravity']) != old_look
+
 
-def show(p):
+def show(p, r):
     """
     Affiche le joueur
     """
@@ -198,4 +334,4 @@ def show(p):
     # Caractère différent selon la direction de la gravité
     char = '?' if p['gravity'] > 0 else '¿'
 
-    sys.stdout.write(f"\033[{y + 1};{x + 1}H{p['color']}{char}\033[0m")
+    Renderer.put(r, x, y, char, COLOR)
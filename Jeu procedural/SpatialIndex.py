@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+class SpatialIndex: pass
+
+
+def create():
+    """
+    Crée un index d'occupation des cases : pour chaque case occupée, la liste de ses occupants
+    Il est tenu à jour à chaque déplacement, ce qui évite de parcourir toutes les entités
+    pour savoir qui se trouve sur une case
+    """
+    return {}  # (x, y) -> occupants
+
+
+def add(index, occupant, x, y):
+    """
+    Place un occupant sur la case (x, y)
+    """
+    index.setdefault((x, y), []).append(occupant)
+
+
+def remove(index, occupant, x, y):
+    """
+    Retire un occupant de la case (x, y)
+    """
+    occupants = index[(x, y)]
+    # Comparer par identité : deux dictionnaires peuvent être égaux sans être le même occupant
+    for i, other in enumerate(occupants):
+        if other is occupant:
+            del occupants[i]
+            break
+    if not occupants:
+        del index[(x, y)]
+
+
+def move(index, occupant, old_x, old_y, x, y):
+    """
+    Déplace un occupant de la case (old_x, old_y) vers la case (x, y)
+    """
+    if old_x == x and old_y == y:
+        return
+
+    occupants = index[(old_x, old_y)]
+    if len(occupants) == 1:
+        # Cas courant : l'occupant était seul sur sa case
+        del index[(old_x, old_y)]
+    else:
+        remove(index, occupant, old_x, old_y)
+
+    occupants = index.get((x, y))
+    if occupants is None:
+        index[(x, y)] = [occupant]
+    else:
+        occupants.append(occupant)
+
+
+def at(index, x, y):
+    """
+    Récupère les occupants de la case (x, y)
+    """
+    return index.get((x, y), ())
+
+
+def near(index, x, y, radius=1):
+    """
+    Récupère les occupants de la case (x, y) et des cases voisines, à radius cases au plus
+    """
+    found = []
+    for ny in range(y - radius, y + radius + 1):
+        for nx in range(x - radius, x + radius + 1):
+            found.extend(index.get((nx, ny), ()))
+    return found
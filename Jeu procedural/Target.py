@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import select
+import shutil
+import sys
+
+
+class Target: pass
+
+
+# Séquence de contrôle CSI : ESC [ paramètres lettre
+CSI = re.compile(r"\033\[([?0-9;]*)([A-Za-z])")
+
+
+def create_terminal(stream=None):
+    """
+    Crée une destination d'affichage : le vrai terminal (sortie standard)
+    """
+    stream = stream if stream is not None else sys.stdout
+    target = {
+        'kind': 'terminal',
+        # Clavier et écran tous deux reliés à un terminal : sinon (sortie redirigée,
+        # service, intégration continue) la partie se joue sans lire de touches
+        'is_tty': stream.isatty() and sys.stdin.isatty(),
+        'stream': stream
+    }
+    return target
+
+
+def create_null(width=160, height=24):
+    """
+    Crée une destination d'affichage qui jette tout (jeu sans terminal, mesures de performance)
+    """
+    target = {
+        'kind': 'null',
+        'is_tty': False,
+        'width': width,
+        'height': height,
+        'bytes_written': 0,
+        'frames': 0
+    }
+    return target
+
+
+def create_memory(width=160, height=24):
+    """
+    Crée une destination d'affichage en mémoire : une grille de caractères qui interprète
+    les séquences de contrôle envoyées par le moteur de rendu comme le ferait un terminal
+    """
+    target = {
+        'kind': 'memory',
+        'is_tty': False,
+        'width': width,
+        'height': height,
+        'bytes_written': 0,
+        'frames': 0,
+        'cursor_x': 0,
+        'cursor_y': 0,
+        'color': "",  # Couleur active
+        'grid': [],
+        'colors': []
+    }
+    clear(target)
+    return target
+
+
+def size(t, default_width=160, default_height=24):
+    """
+    Récupère la taille de l'écran (colonnes, lignes)
+    """
+    if t['kind'] == 'terminal':
+        return tuple(shutil.get_terminal_size((default_width, default_height)))
+    return (t['width'], t['height'])
+
+
+def ready(t):
+    """
+    Indique si la destination peut recevoir une image sans bloquer
+    (faux quand le terminal est saturé, par exemple sur une liaison SSH lente)
+    """
+    if t['kind'] == 'terminal':
+        fd = t['stream'].fileno()
+        return bool(select.select([], [fd], [], 0)[1])
+    return True
+
+
+def write(t, data):
+    """
+    Envoie une image complète à la destination
+    """
+    if t['kind'] == 'terminal':
+        # Vider d'abord ce qui a pu être écrit directement sur le flux
+        t['stream'].flush()
+
+        fd = t['stream'].fileno()
+        view = memoryview(data)
+        while view:
+            # os.write peut n'écrire qu'une partie des octets sur un terminal lent
+            written = os.write(fd, view)
+            view = view[written:]
+        return
+
+    t['bytes_written'] += len(data)
+    t['frames'] += 1
+
+    if t['kind'] == 'memory':
+        text = data.decode('utf-8')
+        pos = 0
+        for match in CSI.finditer(text):
+            print_text(t, text[pos:match.start()])
+            control(t, match.group(1), match.group(2), match.group(0))
+            pos = match.end()
+        print_text(t, text[pos:])
+
+
+def clear(t):
+    """
+    Efface toute la grille d'une destination en mémoire
+    """
+    t['grid'] = [[' '] * t['width'] for _ in range(t['height'])]
+    t['colors'] = [[""] * t['width'] for _ in range(t['height'])]
+
+
+def cell(t, x, y):
+    """
+    Récupère le contenu d'une case d'une destination en mémoire : (caractère, couleur)
+    """
+    return (t['grid'][y][x], t['colors'][y][x])
+
+
+def lines(t):
+    """
+    Récupère le texte affiché par une destination en mémoire, ligne par ligne
+    """
+    return ["".join(row) for row in t['grid']]
+
+
+def print_text(t, text):
+    """
+    Écrit des caractères à la position du curseur
+    """
+    for char in text:
+        if char == '\r':
+            t['cursor_x'] = 0
+        elif char == '\n':
+            t['cursor_y'] = min(t['cursor_y'] + 1, t['height'] - 1)
+        else:
+            if 0 <= t['cursor_y'] < t['height'] and 0 <= t['cursor_x'] < t['width']:
+                t['grid'][t['cursor_y']][t['cursor_x']] = char
+                t['colors'][t['cursor_y']][t['cursor_x']] = t['color']
+            t['cursor_x'] += 1
+
+
+def control(t, params, command, sequence):
+    """
+    Applique une séquence de contrôle (déplacement du curseur, couleur, effacement)
+    """
+    values = [int(value) if value.isdigit() else 0 for value in params.split(';')]
+    n = values[0] or 1
+
+    if command == 'H':  # Position absolue (ligne;colonne), à partir de 1
+        row = values[0] or 1
+        column = values[1] if len(values) > 1 and values[1] else 1
+        t['cursor_y'] = row - 1
+        t['cursor_x'] = column - 1
+    elif command == 'A':  # Haut
+        t['cursor_y'] = max(t['cursor_y'] - n, 0)
+    elif command == 'B':  # Bas
+        t['cursor_y'] = min(t['cursor_y'] + n, t['height'] - 1)
+    elif command == 'C':  # Droite
+        t['cursor_x'] = min(t['cursor_x'] + n, t['width'] - 1)
+    elif command == 'D':  # Gauche
+        t['cursor_x'] = max(min(t['cursor_x'], t['width'] - 1) - n, 0)
+    elif command == 'G':  # Colonne absolue
+        t['cursor_x'] = n - 1
+    elif command == 'm':  # Couleur
+        t['color'] = "" if not any(values) else sequence
+    elif command == 'K':  # Effacer jusqu'à la fin de la ligne
+        if 0 <= t['cursor_y'] < t['height']:
+            for x in range(t['cursor_x'], t['width']):
+                t['grid'][t['cursor_y']][x] = ' '
+                t['colors'][t['cursor_y']][x] = ""
+    elif command == 'J' and values[0] == 2:  # Effacer l'écran
+        clear(t)
+    # Les autres séquences (affichage du curseur...) n'ont pas d'effet sur la grille
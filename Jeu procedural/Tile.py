@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Propriétés des cases du niveau, combinées bit à bit dans la grille de drapeaux du niveau
+SOLID = 1  # Mur ('#')
+PLATFORM = 2  # Plateforme ('=')
+EXIT = 4  # Sortie ('S')
+TELEPORTER = 8  # Téléporteur / sortie secrète ('+')
+SPAWN = 16  # Apparition d'un ennemi standard ('E')
+OUTSIDE = 32  # Hors du niveau
+
+# Cases qui arrêtent le joueur et qui portent les ennemis
+BLOCKING = SOLID | PLATFORM
+
+# Drapeaux d'une case en dehors du niveau : elle se comporte comme un mur
+OUT_OF_BOUNDS = OUTSIDE | SOLID
+
+# Caractère du fichier de niveau -> drapeaux de la case
+FLAGS = {
+    '#': SOLID,
+    '=': PLATFORM,
+    'S': EXIT,
+    '+': TELEPORTER,
+    'E': SPAWN,
+}
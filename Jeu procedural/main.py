@@ -8,24 +8,46 @@ import termios
 import tty
 import threading
 import os
+import signal
 
 import Player
 import Level
+import LevelCache
+import LevelPack
+import Screens
 import Enemy
+import EnemyPool
 import Key
 import Score
+import Renderer
+import Target
+import Camera
+import Governor
+import Perf
+import SpatialIndex
 
 ''
 
+# Durée par défaut d'une partie sans terminal : une minute de jeu
+HEADLESS_TICKS = 6000
 
-def init():
+
+def init(target=None, pack=None, screens=None):
     """
     Initialisation du jeu
+    target: destination de l'affichage (terminal par défaut,
+            Target.create_null() ou Target.create_memory() pour jouer sans terminal)
+    pack: paquet de niveaux (voir LevelPack.py), ouvert ici s'il n'est pas donné
+    screens: écrans du jeu déjà préparés (voir Screens.py), préparés ici s'ils ne sont pas donnés
     """
     data = {
+        'target': target if target is not None else Target.create_terminal(),
         'timeStep': 0.01,  # Pas de temps de simulation
-        'show_period': 0.05,  # Période d'affichage plus rapide
-        'show_time': 0,  # Temps écoulé depuis le dernier affichage
+        'max_steps': 5,  # Nombre maximal de pas de simulation rattrapés d'un coup
+        'show_period': 0.05,  # Période d'affichage initiale
+        'show_period_min': 0.02,  # Bornes de la période d'affichage adaptative
+        'show_period_max': 0.25,
+        # Taille d'écran par défaut quand celle du terminal est inconnue
         'x_min': 0,
         'x_max': 37,
         'y_min': 0,
@@ -33,95 +55,119 @@ def init():
         'score': 0,
         'level': 1,
         'lives': 5,
-        'levels': [],
+        'pack': pack if pack is not None else LevelPack.create(),  # Niveaux et écrans du jeu
+        'screens': screens,  # Écrans du menu, de fin et de victoire
+        'levels': LevelCache.create([]),  # Niveaux du jeu, chargés à la demande
         'player': None,
+        'fixed_point': False,  # Physique du joueur en entiers (SUBTILE unités par case), sur demande
         'enemies': [],  # Liste d'ennemis
+        'active_enemies': [],  # Ennemis qui se déplacent avec la gravité actuelle du joueur
+        'dormant_enemies': [],  # Ennemis suspendus, qui ne coûtent rien à chaque pas
+        'enemies_gravity': None,  # Gravité pour laquelle les ennemis ont été répartis
+        'pooled_enemies': True,  # Ennemis rangés en tableaux, un par attribut, plutôt qu'en dictionnaires
+        'enemy_pool': None,  # Ennemis rangés en tableaux, à la place de la liste
+        'occupancy': SpatialIndex.create(),  # Ennemis de la liste et clé, par case
         'key': None,
         'running': True,
         'has_key': False,
         'old_settings': None,
-        'display_lock': threading.Lock(),  # Verrou pour synchroniser l'affichage
+        # Verrou pour synchroniser l'affichage, réentrant car le signal de redimensionnement
+        # du terminal peut interrompre le thread principal pendant qu'il le détient
+        'display_lock': threading.RLock(),
+        'dirty': True,  # L'image affichée n'est plus à jour
+        'urgent': False,  # Réafficher sans attendre la période d'affichage
+        'resized': False,  # Le terminal a changé de taille
+        'show_perf': False,  # Afficher les statistiques de performance
+        'perf': Perf.create(),
+        'renderer': None,
+        'camera': None,
         'victory': False  # indicateur de victoire
     }
+    data['display_cond'] = threading.Condition(data['display_lock'])  # Réveille le thread d'affichage
 
     # Charger les niveaux
-    level0 = Level.create("niveau-00.txt", 0)
-    level1 = Level.create("niveau-01.txt", 0)
-    level2 = Level.create("niveau-02.txt", 0)
-    level3 = Level.create("niveau-03.txt", 0)
-    level4 = Level.create("niveau-04.txt", 0)
-    level5 = Level.create("niveau-05.txt", 0)
-    level6 = Level.create("niveau-06.txt", 0)
-    level7 = Level.create("niveau-07.txt", 0)
-    level8 = Level.create("niveau-08.txt", 0)
-    level9 = Level.create("niveau-09.txt", 0)
-
-    data['levels'].append(level0)
-    data['levels'].append(level1)
-    data['levels'].append(level2)
-    data['levels'].append(level3)
-    data['levels'].append(level4)
-    data['levels'].append(level5)
-    data['levels'].append(level6)
-    data['levels'].append(level7)
-    data['levels'].append(level8)
-    data['levels'].append(level9)
-
-    # Extraire les positions initiales des éléments du niveau actuel
-    current_level = data['levels'][data['level'] - 1]
-    player_pos = None
-    key_pos = None
-    enemy_positions = []
-    inverted_enemy_positions = []  # Pour les ennemis de type 2 (gravité inversée)
-
-    for y, line in enumerate(current_level['grille']):
-        for x, char in enumerate(line):
-            if char == '@':
-                player_pos = (x, y)
-            elif char == 'K':
-                key_pos = (x, y)
-            elif char == 'E':
-                enemy_positions.append((x, y))
-            elif char == 'F':  # Nouvel ennemi de type 2 (gravité inversée)
-                inverted_enemy_positions.append((x, y))
-
-    # Créer le joueur à la position extraite du niveau
-    if player_pos:
-        data['player'] = Player.create(player_pos[0], player_pos[1])
+    data['levels'] = LevelCache.create(LevelPack.levels(data['pack']), pack=data['pack'])
+    if data['screens'] is None:
+        data['screens'] = Screens.create(data['pack'])
+
+    # Créer les entités du premier niveau depuis sa table d'apparition
+    Level.spawn_entities(data, LevelCache.get(data['levels'], data['level'] - 1))
+
+    if data['target']['is_tty']:
+        # Configuration du terminal pour la détection des touches sans appuyer sur Entrée
+        data['old_settings'] = termios.tcgetattr(sys.stdin)
+        tty.setraw(sys.stdin.fileno())
+
+        # Effacer l'écran et cacher le curseur
+        sys.stdout.write("\033[2J\033[?25l")
+        sys.stdout.flush()
+
+        # Recalculer la mise en page quand le terminal change de taille
+        signal.signal(signal.SIGWINCH, lambda signum, frame: on_resize(data))
+
+    # Moteur de rendu et caméra à la taille de l'écran
+    layout(data)
+
+    # Cadence d'affichage adaptée au coût de chaque image
+    data['governor'] = Governor.create(data['show_period'], data['show_period_min'], data['show_period_max'])
+
+    return data
+
+
+def layout(data):
+    """
+    Adapte le moteur de rendu et la caméra à la taille de l'écran
+    """
+    columns, rows = Target.size(data['target'], 160, data['y_max'])
+
+    if data['renderer'] is None:
+        data['renderer'] = Renderer.create(columns, rows, data['target'])
     else:
-        data['player'] = Player.create(5, 5)  # Position par défaut
+        Renderer.resize(data['renderer'], columns, rows)
 
-    # Créer la clé à la position extraite du niveau
-    if key_pos:
-        data['key'] = Key.create(key_pos[0], key_pos[1])
+    # La dernière ligne de l'écran est réservée aux informations du jeu
+    if data['camera'] is None:
+        data['camera'] = Camera.create(columns, rows - 1)
     else:
-        data['key'] = Key.create(20, 20)  # Position par défaut
+        Camera.resize(data['camera'], columns, rows - 1)
 
-    # Créer les ennemis aux positions extraites du niveau
-    if enemy_positions:
-        for pos in enemy_positions:
-            data['enemies'].append(Enemy.create(pos[0], pos[1], 1))  # Type 1: ennemi standard
 
-    # Créer les ennemis de type 2 (gravité inversée)
-    if inverted_enemy_positions:
-        for pos in inverted_enemy_positions:
-            data['enemies'].append(Enemy.create(pos[0], pos[1], 2))  # Type 2: ennemi gravité inversée
+def on_resize(data):
+    """
+    Réagit au redimensionnement du terminal (SIGWINCH)
+    """
+    data['resized'] = True
+    mark_dirty(data, urgent=True)
 
-    # Configuration du terminal pour la détection des touches sans appuyer sur Entrée
-    data['old_settings'] = termios.tcgetattr(sys.stdin)
-    tty.setraw(sys.stdin.fileno())
 
-    # Effacer l'écran et cacher le curseur
-    sys.stdout.write("\033[2J\033[?25l")
-    sys.stdout.flush()
+def mark_dirty(data, urgent=False):
+    """
+    Signale au thread d'affichage que l'état du jeu a changé
+    urgent: afficher tout de suite (réponse à une touche) sans attendre la période d'affichage
+    """
+    with data['display_cond']:
+        data['dirty'] = True
+        data['urgent'] = data['urgent'] or urgent
+        data['display_cond'].notify()
 
-    return data
+
+def stop(data):
+    """
+    Arrête la partie et réveille le thread d'affichage pour qu'il se termine
+    """
+    with data['display_cond']:
+        data['running'] = False
+        data['display_cond'].notify_all()
 
 
-def is_data():
+def is_data(data):
     """
     Indique s'il y a des événements en attente
     """
+    # Sans terminal, il n'y a pas de clavier à lire
+    if not data['target']['is_tty']:
+        return False
+
     return select.select([sys.stdin], [], [], 0) == ([sys.stdin], [], [])
 
 
@@ -129,7 +175,7 @@ def interact(data):
     """
     Gère les événements clavier
     """
-    if is_data():
+    if is_data(data):
         c = sys.stdin.read(1)
         if c == '\x1b':  # Touche Échap
             quit_game(data)
@@ -138,42 +184,29 @@ def interact(data):
         elif c == 'q':  # Déplacer à gauche
             Player.move_left(data['player'])
             # Afficher immédiatement après le déplacement
-            with data['display_lock']:
-                show(data)
+            mark_dirty(data, urgent=True)
         elif c == 'd':  # Déplacer à droite
             Player.move_right(data['player'])
             # Afficher immédiatement après le déplacement
-            with data['display_lock']:
-                show(data)
+            mark_dirty(data, urgent=True)
         elif c == 'z' or c == ' ':  # Changer la gravité
             Player.gravity_change(data['player'])
             # Afficher immédiatement après le changement de gravité
             data['score'] -= 1
-            with data['display_lock']:
-                show(data)
+            mark_dirty(data, urgent=True)
         elif c == 'e':  # Essayer de ramasser la clé
             Player.pick_key(data)
             # Afficher immédiatement après la tentative de ramassage
-            with data['display_lock']:
-                show(data)
+            mark_dirty(data, urgent=True)
+
+        elif c == 'p':  # Afficher/masquer les statistiques de performance
+            data['show_perf'] = not data['show_perf']
+            mark_dirty(data, urgent=True)
 
         elif c == 'r':  # Redémarrer le niveau actuel
             # Réinitialiser la position du joueur
-            current_level = data['levels'][data['level'] - 1]
-            player_pos = None
-
-            for y, line in enumerate(current_level['grille']):
-                for x, char in enumerate(line):
-                    if char == '@':
-                        player_pos = (x, y)
-                        break
-                if player_pos:
-                    break
-
-            if player_pos:
-                Player.set_pos(data['player'], player_pos[0], player_pos[1])
-            else:
-                Player.set_pos(data['player'], 5, 5)
+            player_x, player_y = Level.player_spawn(LevelCache.get(data['levels'], data['level'] - 1))
+            Player.set_pos(data['player'], player_x, player_y)
 
             # Réinitialiser la gravité et la vitesse
             data['player']['gravity'] = 1
@@ -182,70 +215,126 @@ def interact(data):
             # Réinitialiser la clé
             data['has_key'] = False
 
-            with data['display_lock']:
-                show(data)
+            mark_dirty(data, urgent=True)
 
 
 def live(data):
     """
     Simule l'évolution du jeu sur un pas de temps
     """
-    # Mise à jour du joueur
-    Player.live(data['player'], data)
+    start = time.perf_counter()
 
-    # Mise à jour des ennemis
-    for enemy in data['enemies']:
-        Enemy.live(enemy, data)
+    # Mise à jour du joueur
+    changed = Player.live(data['player'], data)
+
+    # Réveiller et suspendre les ennemis si la gravité s'est inversée
+    if Enemy.sort(data, data['player']['gravity']):
+        changed = True
+
+    # Mise à jour des ennemis actifs, les ennemis suspendus ne coûtent rien
+    updated = 0
+    for enemy in data['active_enemies']:
+        updated += 1
+        if Enemy.live(enemy, data):
+            changed = True
+
+    # Ennemis rangés en tableaux : tous les actifs mis à jour en une passe
+    pool = data['enemy_pool']
+    if pool is not None:
+        if EnemyPool.update(pool, data['player']['gravity']):
+            changed = True
+        updated += EnemyPool.active_count(pool)
 
     # Vérifier si le joueur a atteint la sortie
-    if Level.check_exit(data['levels'][data['level'] - 1], data['player'], data):
-        if data['level'] < len(data['levels']):
+    if Level.check_exit(LevelCache.get(data['levels'], data['level'] - 1), data['player'], data):
+        if data['level'] < LevelCache.size(data['levels']):
             Level.change(data, True)
         else:
             win(data)
+        changed = True
 
     # Vérifier si le joueur a atteint la sortie secrete
-    if Level.check_secret_exit(data['levels'][data['level'] - 1], data['player'], data):
+    if Level.check_secret_exit(LevelCache.get(data['levels'], data['level'] - 1), data['player'], data):
         data['score'] += 10000
         Level.change_to_secret(data, data['level'])
+        changed = True
 
-    # Vérifier les collisions entre le joueur et les ennemis
-    for enemy in data['enemies']:
-        if Enemy.test_player(enemy, data['player']):
-            if enemy['state'] == 0:  # Ne tester que les ennemis actifs
-                game_over(data)
-                break
+    # Vérifier les collisions entre le joueur et les ennemis : seuls ceux qui occupent
+    # la case du joueur peuvent le toucher
+    px, py = int(data['player']['x']), int(data['player']['y'])
+    for enemy in SpatialIndex.at(data['occupancy'], px, py):
+        if enemy is not data['key'] and enemy['state'] == 0:  # Ne tester que les ennemis actifs
+            game_over(data)
+            changed = True
+            break
+
+    # Ennemis rangés en tableaux : une seule recherche sur la case du joueur
+    if pool is not None and EnemyPool.hit(pool, px, py):
+        game_over(data)
+        changed = True
+
+    # Statistiques de performance (réafficher quand elles changent si elles sont visibles)
+    if Perf.record_tick(data['perf'], time.perf_counter() - start, updated) and data['show_perf']:
+        changed = True
+
+    # Ne réveiller le thread d'affichage que si quelque chose a changé
+    if changed:
+        mark_dirty(data)
 
 
 def show(data):
     """
     Fonction d'affichage du jeu
+    Retourne le nombre d'octets envoyés, ou None si l'image a été abandonnée
+    parce que la sortie est saturée
     """
-    # Effacer l'écran
-    sys.stdout.write("\033[H")
+    # Ne pas empiler les images sur une sortie qui n'arrive pas à suivre
+    if not Target.ready(data['target']):
+        return None
+
+    # Le terminal a changé de taille : refaire la mise en page
+    if data['resized']:
+        data['resized'] = False
+        layout(data)
+
+    r = data['renderer']
+    current_level = LevelCache.get(data['levels'], data['level'] - 1)
+
+    # La caméra suit le joueur, seule la fenêtre visible du niveau est dessinée
+    c = data['camera']
+    Camera.follow(c, int(data['player']['x']), int(data['player']['y']), current_level['width'], current_level['height'])
+    Renderer.set_view(r, c['x'], c['y'], c['width'], c['height'])
+
+    # Repartir d'une image vide
+    Renderer.clear(r)
 
     # Afficher le niveau
-    Level.show(data['levels'][data['level'] - 1])
+    Level.show(current_level, r)
 
     # Afficher la clé si elle n'a pas été ramassée
     if not data['has_key']:
-        Key.show(data['key'])
+        Key.show(data['key'], r)
 
     # Afficher les ennemis
     for enemy in data['enemies']:
-        Enemy.show(enemy)
+        Enemy.show(enemy, r)
+    if data['enemy_pool'] is not None:
+        EnemyPool.show(data['enemy_pool'], r)
 
     # Afficher le joueur (en dernier pour qu'il soit au-dessus)
-    Player.show(data['player'])
+    Player.show(data['player'], r)
 
     # Afficher les informations du jeu
-    sys.stdout.write(f"\033[{data['y_max']}H\033[K")
-    sys.stdout.write(
-        f"\033[{data['y_max']}H\033[KVies: {data['lives']} | Niveau: {data['level']} | Score: {int(data['score'])} | ")
-    sys.stdout.write(
-        f"Clé: {'Oui' if data['has_key'] else 'Non'} | [q/d]: Déplacer | [z]: Gravité | [e]: Prendre clé | [r]: Restart | [Echap]: Quitter")
+    Renderer.text(r, 0, r['height'] - 1,
+                  f"Vies: {data['lives']} | Niveau: {data['level']} | Score: {int(data['score'])} | "
+                  f"Clé: {'Oui' if data['has_key'] else 'Non'} | [q/d]: Déplacer | [z]: Gravité | [e]: Prendre clé | [r]: Restart | [p]: Perf | [Echap]: Quitter")
 
-    sys.stdout.flush()
+    # Statistiques de performance juste au-dessus de la ligne d'informations
+    if data['show_perf']:
+        Renderer.text(r, 0, r['height'] - 2, Perf.summary(data['perf']), "\033[36m")
+
+    # N'envoyer au terminal que les cellules modifiées
+    return Renderer.present(r)
 
 
 def game_over(data):
@@ -256,34 +345,15 @@ def game_over(data):
     data['score'] -= 1000
 
     if data['lives'] <= 0:
-        data['running'] = False
+        stop(data)
         data['victory'] = False  # Défaite
 
-        # Nettoyer l'écran
-        sys.stdout.write("\033[H\033[2J")
-        sys.stdout.flush()
-
-        # Déterminer le chemin du fichier fin.txt
-        file_paths = ["./fin.txt", "fin.txt", os.path.join(os.path.dirname(__file__), "fin.txt")]
-        end_text = None
+        # Sans terminal, pas d'écran de fin ni de saisie du score
+        if not data['target']['is_tty']:
+            return
 
-        for path in file_paths:
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    end_text = f.read()
-                    break
-            except (FileNotFoundError, IOError):
-                continue
-
-        # Afficher le texte de fin
-        if end_text:
-            lines = end_text.split('\n')
-            for i, line in enumerate(lines):
-                sys.stdout.write("\033[1;31m" + f"\033[{i + 2};1H{line}" + "\033[0;0m")
-        else:
-            sys.stdout.write("\033[10;30H\033[31mGAME OVER\033[0m")
-
-        sys.stdout.flush()
+        # Afficher l'écran de fin, préparé au démarrage
+        Target.write(data['target'], data['screens']['game_over'])
 
         # Petite pause pour laisser voir le message
         time.sleep(1)
@@ -301,21 +371,8 @@ def game_over(data):
             quit_game(data)
     else:
         # Réinitialiser la position du joueur
-        current_level = data['levels'][data['level'] - 1]
-        player_pos = None
-
-        for y, line in enumerate(current_level['grille']):
-            for x, char in enumerate(line):
-                if char == '@':
-                    player_pos = (x, y)
-                    break
-            if player_pos:
-                break
-
-        if player_pos:
-            Player.set_pos(data['player'], player_pos[0], player_pos[1])
-        else:
-            Player.set_pos(data['player'], 5, 5)
+        player_x, player_y = Level.player_spawn(LevelCache.get(data['levels'], data['level'] - 1))
+        Player.set_pos(data['player'], player_x, player_y)
 
         # Réinitialiser la gravité
         data['player']['gravity'] = 1
@@ -326,35 +383,16 @@ def win(data):
     """
     Termine la partie si le joueur gagne
     """
-    data['running'] = False
+    stop(data)
     data['victory'] = True  # Victoire
     data['score'] += int(5000 * (data['lives']/5) + 50) # Bonus de victoire et pénalité de mort + score du niveau actuel
 
-    # Nettoyer l'écran
-    sys.stdout.write("\033[H\033[2J")
-    sys.stdout.flush()
-
-    # Déterminer le chemin du fichier Victoire.txt
-    file_paths = ["./Victoire.txt", "Victoire.txt", os.path.join(os.path.dirname(__file__), "Victoire.txt")]
-    victory_text = None
-
-    for path in file_paths:
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                victory_text = f.read()
-                break
-        except (FileNotFoundError, IOError):
-            continue
-
-    # Afficher le texte de victoire
-    if victory_text:
-        lines = victory_text.split('\n')
-        for i, line in enumerate(lines):
-            sys.stdout.write("\033[1;32m" + f"\033[{i + 2};1H{line}" + "\033[0;0m")
-    else:
-        sys.stdout.write("\033[1;32m" + "\033[10;30H\033[32mVICTOIRE!\033[0m" + "\033[0;0m")
+    # Sans terminal, pas d'écran de fin ni de saisie du score
+    if not data['target']['is_tty']:
+        return
 
-    sys.stdout.flush()
+    # Afficher l'écran de victoire, préparé au démarrage
+    Target.write(data['target'], data['screens']['victory'])
 
     # Petite pause pour laisser voir le message
     time.sleep(1)
@@ -376,6 +414,10 @@ def quit_game(data):
     """
     Quitte l'application
     """
+    if not data['target']['is_tty']:
+        stop(data)
+        return
+
     # Restaurer les paramètres du terminal
     termios.tcsetattr(sys.stdin, termios.TCSADRAIN, data['old_settings'])
 
@@ -384,108 +426,150 @@ def quit_game(data):
     sys.stdout.write("\033[H\033[2J")
     sys.stdout.flush()
 
-    data['running'] = False
+    stop(data)
     sys.exit(0)
 
 
 def display_thread(data):
     """
     Thread dédié à l'affichage
+    Dort tant que rien n'a changé, puis réaffiche au plus une fois par période d'affichage
+    La période est ajustée par le régulateur selon le coût mesuré des images
     """
-    last_time = time.time()
+    governor = data['governor']
+    last_show = 0
 
     while data['running']:
-        current_time = time.time()
-        elapsed = current_time - last_time
-        last_time = current_time
+        with data['display_cond']:
+            # Attendre qu'un changement soit signalé
+            if not data['dirty']:
+                data['display_cond'].wait()
+                continue
 
-        # Mettre à jour l'affichage périodiquement
-        data['show_time'] += elapsed
-        if data['show_time'] >= data['show_period']:
-            with data['display_lock']:
-                show(data)
-            data['show_time'] = 0
+            # Respecter la période d'affichage, sauf pour répondre à une touche
+            delay = last_show + governor['period'] - time.monotonic()
+            if delay > 0 and not data['urgent']:
+                data['display_cond'].wait(delay)
+                continue
 
-        # Pause pour éviter de surcharger le CPU
-        time.sleep(0.01)
+            data['dirty'] = False
+            data['urgent'] = False
+
+        # Construire et écrire l'image hors du verrou : la simulation signale ses changements
+        # (mark_dirty) sans jamais attendre une écriture lente sur le terminal
+        start = time.monotonic()
+        nbytes = show(data)
+        if nbytes is not None:
+            # Mesurer la construction et l'écriture de l'image
+            cost = time.monotonic() - start
+            Governor.record(governor, cost)
+            Perf.record_frame(data['perf'], cost, nbytes)
+        else:
+            # Image abandonnée : réessayer plus tard avec l'état le plus récent
+            with data['display_cond']:
+                data['dirty'] = True
+            Governor.dropped(governor)
+        last_show = time.monotonic()
 
 
-def run(data):
+def run(data, realtime=True, max_ticks=None):
     """
-    Boucle de simulation avec threading
+    Boucle de simulation à pas de temps fixe avec threading
+    Chaque appel à live() fait avancer le jeu de exactement timeStep secondes,
+    quel que soit le temps réellement mis par la machine
+    realtime: suivre l'horloge ; sinon enchaîner les pas aussi vite que possible (jeu sans terminal)
+    max_ticks: arrêter la partie après ce nombre de pas (None : jusqu'à la fin de la partie)
+    Renvoie le nombre de pas simulés
     """
     # Créer et démarrer le thread d'affichage
     display = threading.Thread(target=display_thread, args=(data,))
     display.daemon = True
     display.start()
 
+    step = data['timeStep']
+    max_lag = step * data['max_steps']
+    accumulator = 0.0  # Temps écoulé pas encore simulé
+    previous = time.monotonic()
+    ticks = 0
+
     # Boucle principale du jeu
     while data['running']:
         # Gérer les entrées utilisateur
         interact(data)
 
-        # Mettre à jour la simulation
-        live(data)
+        if realtime:
+            now = time.monotonic()
+            accumulator += now - previous
+            previous = now
+
+            # Machine trop lente : abandonner le retard plutôt que de l'accumuler sans fin
+            if accumulator > max_lag:
+                accumulator = max_lag
+        else:
+            accumulator = step
+
+        # Rattraper le temps écoulé, un pas fixe à la fois
+        while accumulator >= step and data['running']:
+            live(data)
+            accumulator -= step
+            ticks += 1
+            if max_ticks is not None and ticks >= max_ticks:
+                stop(data)
+
+        # Dormir jusqu'au prochain pas pour ne pas surcharger le CPU
+        if realtime and data['running']:
+            time.sleep(step - accumulator)
 
-        # Pause pour éviter de surcharger le CPU
-        time.sleep(0.01)
+    return ticks
 
 
-def show_main_menu():
+def show_main_menu(screens):
     """
     Affiche le menu principal avec les options
+    screens: écrans du jeu (voir Screens.py)
     """
-    sys.stdout.write("\033[H\033[2J")
+    # Titre et instructions, préparés au démarrage
+    Target.write(Target.create_terminal(), screens['menu'])
 
-    # Déterminer le chemin du fichier ZZZZZZ.txt
-    file_paths = ["./ZZZZZZ.txt", "ZZZZZZ.txt", os.path.join(os.path.dirname(__file__), "ZZZZZZ.txt")]
-    intro_text = None
-
-    for path in file_paths:
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                intro_text = f.read()
-                break
-        except (FileNotFoundError, IOError):
-            continue
-
-    # Afficher le texte d'intro
-    if intro_text:
-        lines = intro_text.split('\n')
-        for i, line in enumerate(lines):
-            sys.stdout.write("\033[1;36m" + f"\033[{i + 2};1H{line}" + "\033[0;0m")
-    else:
-        sys.stdout.write("\033[10;30HZZZZZZ")
-
-    # Afficher les instructions
-    sys.stdout.write("\033[19;25H\033[1;33m╔════════════════════════════════════════╗\033[0m")
-    sys.stdout.write("\033[20;25H\033[1;33m║               INSTRUCTIONS             ║\033[0m")
-    sys.stdout.write("\033[21;25H\033[1;33m╚════════════════════════════════════════╝\033[0m")
-    sys.stdout.write("\033[23;25H[S]: Sortie | [?/¿]: Joueur | [K]: clé")
-    sys.stdout.write("\033[24;25H[E]: Ennemi rouge (actif en gravité normale)")
-    sys.stdout.write("\033[25;25H[F]: Ennemi jaune (actif en gravité inversée)")
-    sys.stdout.write("\033[27;25H\033[1;32m[Entrée]: Jouer | [h]: Scores | [Echap]: Quitter\033[0m")
-    sys.stdout.flush()
+
+def headless(max_ticks=None, pack=None, screens=None):
+    """
+    Joue une partie sans terminal : aucune touche lue, affichage jeté, pas enchaînés sans suivre l'horloge
+    max_ticks: arrêter la partie après ce nombre de pas (None : jusqu'à la fin de la partie)
+    pack, screens: paquet de niveaux et écrans déjà préparés (voir init)
+    """
+    data = init(Target.create_null(), pack=pack, screens=screens)
+    ticks = run(data, realtime=False, max_ticks=max_ticks)
+    print(f"{ticks} pas | Vies: {data['lives']} | Niveau: {data['level']} | Score: {int(data['score'])}")
 
 
 def main():
     """
     Fonction principale du jeu
     """
+    # Pas de terminal pour lire les touches : jouer directement, sans menu
+    if not Target.create_terminal()['is_tty']:
+        headless(HEADLESS_TICKS)
+        return
+
     # Configuration du terminal pour la détection des touches
     old_settings = termios.tcgetattr(sys.stdin)
     tty.setraw(sys.stdin.fileno())
 
+    # Niveaux et écrans du jeu : archive lue en une fois ou fichiers séparés
+    pack = LevelPack.create()
+    screens = Screens.create(pack)
+
     try:
         while True:
-            show_main_menu()
+            show_main_menu(screens)
 
             # Attendre une action de l'utilisateur
             while True:
                 key = sys.stdin.read(1)
                 if key == '\r':  # Entrée - Jouer
                     # Initialiser et lancer le jeu
-                    data = init()
+                    data = init(pack=pack, screens=screens)
                     run(data)
                     break  # Sortir de la boucle pour revenir au menu principal
 
@@ -513,5 +597,31 @@ def main():
         sys.exit(0)
 
 
+def parse_args(args):
+    """
+    Lit les options de la ligne de commande
+    --headless : jouer sans terminal, l'affichage est jeté
+    --ticks N : nombre de pas de la partie sans terminal (implique --headless)
+    Renvoie (sans terminal, nombre de pas)
+    """
+    is_headless = False
+    ticks = HEADLESS_TICKS
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg == "--headless":
+            is_headless = True
+        elif arg == "--ticks" and args and args[0].isdigit():
+            is_headless = True
+            ticks = int(args.pop(0))
+        else:
+            sys.exit(f"Option inconnue : {arg} (usage : main.py [--headless] [--ticks N])")
+    return is_headless, ticks
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    is_headless, ticks = parse_args(sys.argv[1:])
+    if is_headless:
+        headless(ticks)
+    else:
+        main()
\ No newline at end of file